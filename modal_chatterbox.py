@@ -1,9 +1,69 @@
 """
 Chatterbox TTS on Modal with GPU Support
 Deploy with: modal deploy modal_chatterbox.py
+Smoke test with: modal run modal_chatterbox.py::test
+Measure capacity with: modal run modal_chatterbox.py::capacity
+Store serialized weights with: modal run modal_chatterbox.py::prepare_weights
+Measure a cold start with: modal run modal_chatterbox.py::cold_start
+Stream a chapter with: modal run modal_chatterbox.py::stream_chapter --path manuscript-chapters/chapter_01.txt
+Fan a whole book out to all containers with: modal run modal_chatterbox.py::fanout_book --lang all
+
+Scaling is set when the app is deployed, from CHATTERBOX_MAX_INPUTS,
+CHATTERBOX_TARGET_INPUTS, CHATTERBOX_MIN_CONTAINERS, CHATTERBOX_MAX_CONTAINERS
+and CHATTERBOX_SCALEDOWN_SECONDS, e.g.:
+
+    CHATTERBOX_MIN_CONTAINERS=1 CHATTERBOX_MAX_CONTAINERS=12 modal deploy modal_chatterbox.py
+
+Capacity model: a container runs one generation at a time (the model holds
+the active voice, so calls take turns on it), taking G seconds per chunk.
+Each call also spends O seconds outside the model: receiving the request,
+looking up the voice and encoding the audio. Serving one input at a time,
+a container finishes 60 / (G + O) chunks per minute; with MAX_INPUTS > 1
+the overhead of one call overlaps another's generation, approaching
+60 / max(G, (G + O) / MAX_INPUTS). A book render at --concurrency C keeps
+about C / TARGET_INPUTS containers busy (at most MAX_CONTAINERS); inputs
+beyond that queue inside warm containers, up to MAX_INPUTS each, instead of
+waiting for a cold start. The capacity entrypoint measures G and O on the
+deployment and prints the resulting table.
+
+Inference mode, per deployment: CHATTERBOX_INFERENCE_MODE=default runs the
+model as shipped; "optimized" runs every generation under
+torch.inference_mode with float16 autocast on the GPU, and on CPU compiles
+the T3 transformer with torch.compile (autocast to CHATTERBOX_CPU_DTYPE,
+float32 by default, or bfloat16). scripts/benchmark-chatterbox-inference.py
+compares both modes on CPU.
+
+Cold starts: the model is loaded on CPU from a single serialized file on the
+chatterbox-weights volume (written by prepare_weights; otherwise from the
+Hugging Face cache baked into the image), the loaded process is captured in
+a Modal memory snapshot, and only the move to the GPU runs after a restore.
+Each container records how long every startup phase took.
 """
+import os
+import pathlib
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
 import modal
 
+# Deployment settings, read from the environment of `modal deploy`. Containers
+# import this module again with only the image's environment, so the ones
+# used at runtime are baked into the image below.
+
+# Snapshot the container after the model is loaded on CPU and restore from it
+# on later cold starts
+MEMORY_SNAPSHOT = os.environ.get("CHATTERBOX_MEMORY_SNAPSHOT", "1") != "0"
+
+# "default" or "optimized" (see the module docstring)
+INFERENCE_MODES = ("default", "optimized")
+INFERENCE_MODE = os.environ.get("CHATTERBOX_INFERENCE_MODE", "default")
+CPU_DTYPE = os.environ.get("CHATTERBOX_CPU_DTYPE", "float32")
+
+# Speaker conditionings kept in memory per container (least recently used are dropped)
+MAX_CACHED_VOICES = int(os.environ.get("CHATTERBOX_MAX_CACHED_VOICES", "8"))
+
 # Create Modal app
 app = modal.App("chatterbox-tts")
 
@@ -22,30 +82,308 @@ image = (
     .run_commands(
         "python -c 'from chatterbox.tts_turbo import ChatterboxTurboTTS; ChatterboxTurboTTS.from_pretrained(device=\"cpu\")'"
     )
+    # The deployment's runtime settings, so containers see the values deployed with
+    .env({
+        "CHATTERBOX_MEMORY_SNAPSHOT": "1" if MEMORY_SNAPSHOT else "0",
+        "CHATTERBOX_INFERENCE_MODE": INFERENCE_MODE,
+        "CHATTERBOX_CPU_DTYPE": CPU_DTYPE,
+        "CHATTERBOX_MAX_CACHED_VOICES": str(MAX_CACHED_VOICES),
+    })
+    # The audiobook scripts' sentence chunker (generate_stream) and multi-text loop (generate_batch)
+    .add_local_dir(pathlib.Path(__file__).parent / "scripts" / "audiobook", remote_path="/root/audiobook")
 )
 
 # Create volume for voice samples
 voice_volume = modal.Volume.from_name("chatterbox-voices", create_if_missing=True)
 VOICE_DIR = "/voices"
 
+# Seconds between reloads of the voice volume, which is how a container sees
+# samples uploaded or replaced through another one; a voice not found on the
+# volume always reloads it first
+VOICE_RELOAD_SECONDS = 30
+
+# Volume holding the loaded CPU model serialized with torch.save, one file per
+# chatterbox-tts version so an upgrade never loads an incompatible pickle
+weights_volume = modal.Volume.from_name("chatterbox-weights", create_if_missing=True)
+WEIGHTS_DIR = "/weights"
+
+# Characters per model call in generate_stream: the length Chatterbox Turbo
+# handles without drifting (as in scripts/audiobook/providers.py), and a
+# short first chunk so the first audio is back within seconds
+STREAM_MAX_CHARS = 600
+STREAM_FIRST_CHARS = 200
+
+# Inputs a container accepts at once, and how many the autoscaler aims for
+# before starting another container
+MAX_INPUTS = int(os.environ.get("CHATTERBOX_MAX_INPUTS", "4"))
+TARGET_INPUTS = int(os.environ.get("CHATTERBOX_TARGET_INPUTS", "2"))
+
+# Warm containers kept even when idle, the most the app may run, and idle
+# seconds before a container is shut down
+MIN_CONTAINERS = int(os.environ.get("CHATTERBOX_MIN_CONTAINERS", "0"))
+MAX_CONTAINERS = int(os.environ.get("CHATTERBOX_MAX_CONTAINERS", "8"))
+SCALEDOWN_SECONDS = int(os.environ.get("CHATTERBOX_SCALEDOWN_SECONDS", "300"))
+
+
+def chunks_per_minute(generation_seconds, overhead_seconds, max_inputs=MAX_INPUTS):
+    """
+    Chunks one warm container finishes per minute (see the capacity model above)
+    
+    Args:
+        generation_seconds: Model time per chunk, serialized within a container
+        overhead_seconds: Time per call spent outside the model
+        max_inputs: Inputs the container accepts at once
+    """
+    if max_inputs > 1:
+        seconds = max(generation_seconds, (generation_seconds + overhead_seconds) / max_inputs)
+    else:
+        seconds = generation_seconds + overhead_seconds
+    return 60 / seconds if seconds > 0 else float("inf")
+
+
+def _weights_path():
+    """Serialized model file for the installed chatterbox-tts version"""
+    from importlib.metadata import version
+    
+    return pathlib.Path(WEIGHTS_DIR) / f"chatterbox-turbo-{version('chatterbox-tts')}.pt"
+
+
+def _load_cpu_model():
+    """
+    Load the model on CPU, preferring the serialized file on the weights volume
+    
+    Returns:
+        (model, source) where source is "volume" or "hub"
+    """
+    import torch
+    from chatterbox.tts_turbo import ChatterboxTurboTTS
+    
+    path = _weights_path()
+    if path.exists():
+        try:
+            # mmap maps the tensors instead of reading the whole file up front
+            return torch.load(path, map_location="cpu", weights_only=False, mmap=True), "volume"
+        except Exception as error:
+            print(f"Could not load {path} ({error}), loading from the hub cache")
+    return ChatterboxTurboTTS.from_pretrained(device="cpu"), "hub"
+
+
+def _optimize_model(model, device, mode=INFERENCE_MODE):
+    """
+    Prepare a loaded model for ``mode`` on ``device``
+    
+    Only CPU inference is compiled: on the GPU the float16 autocast of
+    ``_inference_context`` is the optimization, and compiling would add
+    minutes to every cold start. Models without a T3 transformer to compile
+    are left as they are.
+    """
+    import torch
+    
+    if mode not in INFERENCE_MODES:
+        raise ValueError(f"Unknown inference mode '{mode}', expected one of {INFERENCE_MODES}")
+    if mode != "optimized" or device != "cpu":
+        return model
+    t3 = getattr(model, "t3", None)
+    if t3 is not None and getattr(t3, "tfmr", None) is not None:
+        # Decoding grows the sequence by one token per step, so shapes are dynamic
+        t3.tfmr = torch.compile(t3.tfmr, dynamic=True)
+    return model
+
+
+@contextmanager
+def _inference_context(device, mode=INFERENCE_MODE):
+    """Context for one generation: nothing by default, inference mode and autocast when optimized"""
+    import torch
+    
+    if mode != "optimized":
+        yield
+        return
+    with torch.inference_mode():
+        if device == "cuda":
+            with torch.autocast("cuda", dtype=torch.float16):
+                yield
+        elif CPU_DTYPE == "bfloat16":
+            with torch.autocast("cpu", dtype=torch.bfloat16):
+                yield
+        else:
+            yield
+
+
+def _move_model(model, device):
+    """Move a ChatterboxTurboTTS loaded on CPU to ``device``"""
+    for name in ("t3", "s3gen", "ve"):
+        module = getattr(model, name, None)
+        if module is not None:
+            module.to(device)
+    if getattr(model, "conds", None) is not None:
+        model.conds = model.conds.to(device)
+    model.device = device
+    return model
+
+
+class _ConditionalsCache:
+    """
+    LRU cache of speaker conditionings keyed by voice name
+
+    Entries remember the voice file's size and mtime, so a sample replaced on
+    the volume is re-conditioned on next use. Another container's upload is
+    only visible here once the volume is reloaded (see VOICE_RELOAD_SECONDS).
+    """
+    
+    def __init__(self, max_voices=MAX_CACHED_VOICES):
+        self.max_voices = max_voices
+        self.entries = OrderedDict()
+    
+    def get(self, model, voice_name, voice_path):
+        """Return conditionals for ``voice_name``, computing them if missing or stale"""
+        stat = voice_path.stat()
+        signature = (stat.st_size, stat.st_mtime_ns)
+        entry = self.entries.get(voice_name)
+        if entry is not None and entry[0] == signature:
+            self.entries.move_to_end(voice_name)
+            return entry[1]
+        
+        print(f"Conditioning voice '{voice_name}'...")
+        model.prepare_conditionals(str(voice_path))
+        self.entries[voice_name] = (signature, model.conds)
+        self.entries.move_to_end(voice_name)
+        while len(self.entries) > self.max_voices:
+            self.entries.popitem(last=False)
+        return model.conds
+    
+    def invalidate(self, voice_name):
+        self.entries.pop(voice_name, None)
+
+
+def _stream_chunks(text, lang="en", max_chars=STREAM_MAX_CHARS, first_chars=STREAM_FIRST_CHARS):
+    """
+    Split a chapter into chunks for generate_stream, starting with a short one
+    
+    The first chunk ends at the first sentence boundary that fits in
+    ``first_chars``; the rest of the text is chunked up to ``max_chars``.
+    """
+    from audiobook.chunker import chunk_spans, chunk_text
+    
+    spans = chunk_spans(text, min(first_chars, max_chars), lang=lang)
+    if not spans:
+        return []
+    first_end = spans[0][1]
+    return (chunk_text(text[:first_end], first_chars, lang=lang)
+            + chunk_text(text[first_end:], max_chars, lang=lang))
+
+
+# Formats generate_bytes can return (FLAC is lossless and roughly half the size of WAV)
+AUDIO_FORMATS = ("wav", "flac")
+
+
+def _encode_wav(wav, sample_rate):
+    """Encode a waveform tensor as WAV bytes"""
+    return _encode_audio(wav, sample_rate, "wav")
+
+
+def _encode_audio(wav, sample_rate, audio_format):
+    """Encode a waveform tensor as WAV or FLAC bytes"""
+    import io
+    import torchaudio
+    
+    if audio_format not in AUDIO_FORMATS:
+        raise ValueError(f"Unsupported audio format '{audio_format}', expected one of {AUDIO_FORMATS}")
+    audio_buffer = io.BytesIO()
+    torchaudio.save(audio_buffer, wav, sample_rate, format=audio_format)
+    return audio_buffer.getvalue()
+
 @app.cls(
     image=image,
     gpu="T4",  # Use NVIDIA T4 GPU
     timeout=600,  # 10 minute timeout
-    volumes={VOICE_DIR: voice_volume},
+    volumes={VOICE_DIR: voice_volume, WEIGHTS_DIR: weights_volume},
+    enable_memory_snapshot=MEMORY_SNAPSHOT,
+    min_containers=MIN_CONTAINERS,
+    max_containers=MAX_CONTAINERS,
+    scaledown_window=SCALEDOWN_SECONDS,
 )
+@modal.concurrent(max_inputs=MAX_INPUTS, target_inputs=min(TARGET_INPUTS, MAX_INPUTS))
 class ChatterboxTTS:
-    @modal.enter()
+    @modal.enter(snap=True)
     def load_model(self):
-        """Load model on GPU when container starts"""
+        """Load the model on CPU; with memory snapshots this runs once per snapshot, not per container"""
+        print("Loading Chatterbox model on cpu...")
+        start = time.perf_counter()
+        self.model, source = _load_cpu_model()
+        self.startup = {
+            "weights_source": source,
+            "load_seconds": time.perf_counter() - start,
+            "loaded_at": time.time(),
+        }
+        # The task that ran the snapshot phase; a container restored from the
+        # snapshot is another task and finds a different ID in move_to_gpu
+        self.snapshot_task = os.environ.get("MODAL_TASK_ID") if MEMORY_SNAPSHOT else None
+        self.device = "cpu"
+        self.voice_conds = _ConditionalsCache()
+        self.voices_reloaded_at = None
+        # Inputs run on concurrent threads, but the model, the conditionals
+        # cache and the voice volume are shared: every use of any holds this lock
+        self.model_lock = threading.Lock()
+        print(f"Model loaded from {source} in {self.startup['load_seconds']:.1f}s")
+    
+    @modal.enter(snap=False)
+    def move_to_gpu(self):
+        """Move the model to the GPU when the container (or its restored snapshot) starts"""
         import torch
-        from chatterbox.tts_turbo import ChatterboxTurboTTS
         
+        start = time.perf_counter()
         device = "cuda" if torch.cuda.is_available() else "cpu"
-        print(f"Loading Chatterbox model on {device}...")
-        self.model = ChatterboxTurboTTS.from_pretrained(device=device)
-        self.device = device
-        print("Model loaded successfully")
+        if device != self.device:
+            _move_model(self.model, device)
+            self.device = device
+        _optimize_model(self.model, device)
+        ready_at = time.time()
+        self.startup.update({
+            "device": device,
+            "inference_mode": INFERENCE_MODE,
+            "to_device_seconds": time.perf_counter() - start,
+            "restored_from_snapshot": (self.snapshot_task is not None
+                                       and self.snapshot_task != os.environ.get("MODAL_TASK_ID")),
+            "ready_at": ready_at,
+        })
+        print(f"Model ready on {device}: {self.startup}")
+    
+    @modal.method()
+    def startup_timings(self) -> dict:
+        """How this container started: weights source, load and device-move seconds, snapshot restore"""
+        return dict(self.startup)
+    
+    def _voice_conditionals(self, voice_name):
+        """Cached speaker conditionals for a voice sample on the volume; call with ``model_lock`` held"""
+        voice_path = pathlib.Path(VOICE_DIR) / f"{voice_name}.wav"
+        
+        stale = (self.voices_reloaded_at is None
+                 or time.monotonic() - self.voices_reloaded_at >= VOICE_RELOAD_SECONDS)
+        if stale or not voice_path.exists():
+            # Pick up samples uploaded or replaced through other containers
+            voice_volume.reload()
+            self.voices_reloaded_at = time.monotonic()
+        if not voice_path.exists():
+            raise FileNotFoundError(f"Voice sample '{voice_name}' not found at {voice_path}")
+        
+        return self.voice_conds.get(self.model, voice_name, voice_path)
+    
+    @contextmanager
+    def _model_for(self, voice_name):
+        """Hold the model, conditioned on ``voice_name``, for the duration of the block"""
+        with self.model_lock:
+            self.model.conds = self._voice_conditionals(voice_name)
+            yield self.model
+    
+    def _generate(self, text, voice_name):
+        """Generate one waveform, returning it with the seconds spent in the model"""
+        with self._model_for(voice_name) as model:
+            print(f"Generating audio for text: {text[:50]}...")
+            start = time.perf_counter()
+            with _inference_context(self.device):
+                wav = model.generate(text)
+            # Encoders expect float32 whatever the autocast produced
+            return wav.float(), time.perf_counter() - start
     
     @modal.method()
     def upload_voice(self, voice_name: str, voice_data_b64: str):
@@ -57,14 +395,29 @@ class ChatterboxTTS:
             voice_data_b64: Base64-encoded WAV audio
         """
         import base64
-        import pathlib
         
-        voice_path = pathlib.Path(VOICE_DIR) / f"{voice_name}.wav"
-        voice_bytes = base64.b64decode(voice_data_b64)
-        voice_path.write_bytes(voice_bytes)
+        return self._save_voice(voice_name, base64.b64decode(voice_data_b64))
+    
+    @modal.method()
+    def upload_voice_bytes(self, voice_name: str, voice_data: bytes):
+        """
+        Upload a voice sample to the volume as raw WAV bytes
         
-        # Commit the volume
-        voice_volume.commit()
+        Args:
+            voice_name: Name for the voice (e.g., "marco")
+            voice_data: WAV audio
+        """
+        return self._save_voice(voice_name, voice_data)
+    
+    def _save_voice(self, voice_name, voice_bytes):
+        voice_path = pathlib.Path(VOICE_DIR) / f"{voice_name}.wav"
+        # Under the lock so a reload never runs while the file is open
+        with self.model_lock:
+            voice_path.write_bytes(voice_bytes)
+            
+            # Commit the volume
+            voice_volume.commit()
+            self.voice_conds.invalidate(voice_name)
         
         return {"voice_path": str(voice_path)}
     
@@ -78,30 +431,17 @@ class ChatterboxTTS:
             voice_name: Name of the voice sample to use
         
         Returns:
-            dict with 'audio_b64' (base64-encoded WAV) and 'sample_rate'
+            dict with 'audio_b64' (base64-encoded WAV), 'sample_rate',
+            'generation_seconds' (time spent in the model) and 'worker'
+            (the Modal task that served the call)
         """
-        import torchaudio
         import base64
-        import io
-        import pathlib
         
-        # Get voice sample path
-        voice_path = pathlib.Path(VOICE_DIR) / f"{voice_name}.wav"
-        
-        if not voice_path.exists():
-            raise FileNotFoundError(f"Voice sample '{voice_name}' not found at {voice_path}")
-        
-        # Generate audio
-        print(f"Generating audio for text: {text[:50]}...")
-        wav = self.model.generate(
-            text,
-            audio_prompt_path=str(voice_path)
-        )
+        # Reuse the voice's speaker conditioning instead of reloading the prompt
+        wav, generation_seconds = self._generate(text, voice_name)
         
         # Convert to WAV bytes
-        audio_buffer = io.BytesIO()
-        torchaudio.save(audio_buffer, wav, self.model.sr, format="wav")
-        audio_bytes = audio_buffer.getvalue()
+        audio_bytes = _encode_wav(wav, self.model.sr)
         
         # Encode to base64
         audio_b64 = base64.b64encode(audio_bytes).decode('utf-8')
@@ -109,8 +449,374 @@ class ChatterboxTTS:
         return {
             "audio_b64": audio_b64,
             "sample_rate": self.model.sr,
-            "text_length": len(text)
+            "text_length": len(text),
+            "generation_seconds": generation_seconds,
+            "worker": os.environ.get("MODAL_TASK_ID"),
         }
+    
+    @modal.method()
+    def generate_bytes(self, text: str, voice_name: str = "marco", audio_format: str = "flac") -> bytes:
+        """
+        Generate speech and return the encoded audio as raw bytes
+        
+        Skips the base64-in-dict wrapping of ``generate``, which inflates the
+        payload by a third and costs an encode/decode on each side. The sample
+        rate is in the WAV/FLAC header.
+        
+        Args:
+            text: Text to synthesize
+            voice_name: Name of the voice sample to use
+            audio_format: "flac" (default) or "wav"
+        """
+        wav, _ = self._generate(text, voice_name)
+        return _encode_audio(wav, self.model.sr, audio_format)
+    
+    @modal.method()
+    def generate_bytes_with_worker(self, text: str, voice_name: str = "marco",
+                                   audio_format: str = "flac") -> tuple[str, bytes]:
+        """
+        ``generate_bytes`` that also says which container served the call
+        
+        For fan-out, whose load report is per container.
+        
+        Returns:
+            (worker, audio): the Modal task ID and the encoded audio
+        """
+        wav, _ = self._generate(text, voice_name)
+        return os.environ.get("MODAL_TASK_ID"), _encode_audio(wav, self.model.sr, audio_format)
+    
+    @modal.method()
+    def generate_stream(self, text: str, voice_name: str = "marco", audio_format: str = "flac",
+                        lang: str = "en", max_chars: int = STREAM_MAX_CHARS):
+        """
+        Synthesize a whole chapter, yielding each chunk's audio as soon as it is generated
+        
+        The text is split on sentence boundaries here, with a short first
+        chunk, so the caller neither chunks it nor waits for the whole
+        chapter. The model is released between chunks, letting other inputs
+        on the container take turns.
+        
+        Call with ``.remote_gen(...)``.
+        
+        Args:
+            text: Chapter text
+            voice_name: Name of the voice sample to use
+            audio_format: "flac" (default) or "wav", for each segment
+            lang: 'en' or 'pt', for sentence splitting
+            max_chars: Characters per chunk after the first
+        
+        Yields:
+            dicts in text order with 'index', 'count', 'text', 'audio' (encoded
+            bytes), 'sample_rate' and 'generation_seconds'
+        """
+        if audio_format not in AUDIO_FORMATS:
+            raise ValueError(f"Unsupported audio format '{audio_format}', expected one of {AUDIO_FORMATS}")
+        chunks = _stream_chunks(text, lang, max_chars)
+        print(f"Streaming {len(chunks)} chunks ({len(text)} characters)...")
+        for index, chunk in enumerate(chunks):
+            wav, generation_seconds = self._generate(chunk, voice_name)
+            yield {
+                "index": index,
+                "count": len(chunks),
+                "text": chunk,
+                "audio": _encode_audio(wav, self.model.sr, audio_format),
+                "sample_rate": self.model.sr,
+                "generation_seconds": generation_seconds,
+            }
+    
+    @modal.method()
+    def generate_batch(self, texts: list[str], voice_name: str = "marco") -> list[dict]:
+        """
+        Generate speech for many texts in one call
+        
+        The model still generates one text at a time; the request amortizes
+        the round trip and the voice lookup over all of them (see
+        scripts/audiobook/amortized.py). Other inputs on the container wait
+        for the model until the whole list is done.
+        
+        Args:
+            texts: Texts to synthesize (e.g. all chunks of a chapter)
+            voice_name: Name of the voice sample to use
+        
+        Returns:
+            List of dicts in the same order as ``texts``, each shaped like ``generate``'s result;
+            'generation_seconds' is that text's own time in the model
+        """
+        import base64
+        from audiobook.amortized import generate_many
+        
+        print(f"Generating audio for {len(texts)} texts in one request...")
+        # Same context as _generate: conditioning outside it, generation inside
+        timings = []
+        with self.model_lock:
+            conds = self._voice_conditionals(voice_name)
+            with _inference_context(self.device):
+                wavs = [wav.float() for wav in generate_many(self.model, texts, conds, timings)]
+        
+        worker = os.environ.get("MODAL_TASK_ID")
+        return [
+            {
+                "audio_b64": base64.b64encode(_encode_wav(wav, self.model.sr)).decode('utf-8'),
+                "sample_rate": self.model.sr,
+                "text_length": len(text),
+                "generation_seconds": generation_seconds,
+                "worker": worker,
+            }
+            for text, wav, generation_seconds in zip(texts, wavs, timings)
+        ]
+
+class ChatterboxClient:
+    """
+    Client for the deployed service using the raw-bytes methods
+    
+    Usage:
+        client = ChatterboxClient()
+        client.upload_voice("marco", "/tmp/voice_sample.wav")
+        flac_bytes = client.synthesize("Hello there.")
+    """
+    
+    def __init__(self, app_name="chatterbox-tts", class_name="ChatterboxTTS"):
+        self.tts = modal.Cls.from_name(app_name, class_name)()
+    
+    def upload_voice(self, voice_name, wav_path):
+        with open(wav_path, "rb") as f:
+            return self.tts.upload_voice_bytes.remote(voice_name=voice_name, voice_data=f.read())
+    
+    def synthesize(self, text, voice_name="marco", audio_format="flac"):
+        """Return encoded audio bytes for ``text``"""
+        return self.tts.generate_bytes.remote(text=text, voice_name=voice_name, audio_format=audio_format)
+    
+    def synthesize_chapter(self, text, voice_name="marco", audio_format="flac", lang="en"):
+        """Yield ``generate_stream`` segments for a whole chapter, in order, as they are generated"""
+        yield from self.tts.generate_stream.remote_gen(text=text, voice_name=voice_name,
+                                                       audio_format=audio_format, lang=lang)
+
+
+@app.local_entrypoint()
+def compare_transports(
+    text: str = "This is a test of the Chatterbox text to speech system running on Modal with voice cloning.",
+    voice_name: str = "marco",
+    runs: int = 3,
+):
+    """
+    Compare payload size and end-to-end latency of the base64 and raw-bytes paths
+    
+    Run with: modal run modal_chatterbox.py::compare_transports
+    """
+    import base64
+    import statistics
+    
+    tts = ChatterboxTTS()
+    # Warm the container and the voice conditioning so timings compare transports only
+    tts.generate_bytes.remote(text=text, voice_name=voice_name, audio_format="wav")
+    
+    def measure(name, call, to_audio, payload_size):
+        latencies = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            result = call()
+            audio = to_audio(result)
+            latencies.append(time.perf_counter() - start)
+        print(f"{name:<16} payload {payload_size(result) / 1024:8.1f} KB  "
+              f"audio {len(audio) / 1024:8.1f} KB  median {statistics.median(latencies):6.2f}s")
+    
+    print(f"Comparing transports over {runs} runs ({len(text)} characters)")
+    measure(
+        "base64 dict",
+        lambda: tts.generate.remote(text=text, voice_name=voice_name),
+        lambda result: base64.b64decode(result["audio_b64"]),
+        lambda result: len(result["audio_b64"]),
+    )
+    for audio_format in AUDIO_FORMATS:
+        measure(
+            f"raw {audio_format}",
+            lambda: tts.generate_bytes.remote(text=text, voice_name=voice_name, audio_format=audio_format),
+            lambda result: result,
+            len,
+        )
+
+
+@app.local_entrypoint()
+def capacity(
+    text: str = "This is a test of the Chatterbox text to speech system running on Modal with voice cloning.",
+    voice_name: str = "marco",
+    runs: int = 5,
+    book_chunks: int = 1200,
+):
+    """
+    Measure model time and per-call overhead on the deployment and print the capacity model
+    
+    Run with: modal run modal_chatterbox.py::capacity
+    """
+    import statistics
+    
+    tts = ChatterboxTTS()
+    # Warm a container and the voice conditioning first
+    tts.generate.remote(text=text, voice_name=voice_name)
+    
+    generation = []
+    overhead = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = tts.generate.remote(text=text, voice_name=voice_name)
+        total = time.perf_counter() - start
+        generation.append(result["generation_seconds"])
+        overhead.append(total - result["generation_seconds"])
+    g = statistics.median(generation)
+    o = statistics.median(overhead)
+    
+    print(f"{len(text)} characters: {g:.2f}s in the model, {o:.2f}s overhead per call (median of {runs})")
+    print(f"{'Inputs':>6}  {'Chunks/min':>10}  {f'Book of {book_chunks} chunks on {MAX_CONTAINERS} containers':>36}")
+    for max_inputs in sorted({1, TARGET_INPUTS, MAX_INPUTS}):
+        per_minute = chunks_per_minute(g, o, max_inputs)
+        minutes = book_chunks / (per_minute * MAX_CONTAINERS)
+        print(f"{max_inputs:>6}  {per_minute:>10.1f}  {minutes:>33.1f} min")
+
+
+@app.function(image=image, volumes={WEIGHTS_DIR: weights_volume}, timeout=1800)
+def prepare_weights():
+    """
+    Serialize the loaded CPU model to the weights volume
+    
+    Run with: modal run modal_chatterbox.py::prepare_weights
+    (again after upgrading chatterbox-tts; the file name includes its version)
+    """
+    import torch
+    from chatterbox.tts_turbo import ChatterboxTurboTTS
+    
+    path = _weights_path()
+    model = ChatterboxTurboTTS.from_pretrained(device="cpu")
+    temp_path = path.with_name(path.name + ".tmp")
+    torch.save(model, temp_path)
+    os.replace(temp_path, path)
+    weights_volume.commit()
+    print(f"Saved {path} ({path.stat().st_size / 1024 / 1024:.0f} MB)")
+    return str(path)
+
+
+@app.local_entrypoint()
+def cold_start(history: str = "/tmp/chatterbox-cold-starts.jsonl"):
+    """
+    Time the first call to a container and record its startup phases
+    
+    Run when no container is warm (e.g. after the scale-down window). Each
+    run is appended to ``history`` so cold starts before and after a change
+    can be compared.
+    
+    Run with: modal run modal_chatterbox.py::cold_start
+    """
+    import json
+    import statistics
+    
+    start = time.perf_counter()
+    timings = ChatterboxTTS().startup_timings.remote()
+    timings["first_call_seconds"] = time.perf_counter() - start
+    timings["memory_snapshot"] = MEMORY_SNAPSHOT
+    with open(history, "a", encoding="utf-8") as f:
+        f.write(json.dumps(timings) + "\n")
+    
+    print(f"First call answered in {timings['first_call_seconds']:.1f}s")
+    print(f"   weights from {timings['weights_source']}: {timings['load_seconds']:.1f}s load, "
+          f"{timings['to_device_seconds']:.1f}s to {timings['device']}, "
+          f"{'restored from' if timings['restored_from_snapshot'] else 'no'} memory snapshot")
+    
+    with open(history, "r", encoding="utf-8") as f:
+        runs = [json.loads(line) for line in f if line.strip()]
+    groups = {}
+    for run in runs:
+        key = (run["weights_source"], "snapshot" if run["restored_from_snapshot"] else "no snapshot")
+        groups.setdefault(key, []).append(run["first_call_seconds"])
+    print(f"Cold starts recorded in {history}:")
+    for (source, snapshot), seconds in sorted(groups.items()):
+        print(f"   {source:<7} {snapshot:<12} {len(seconds):>3} runs  median {statistics.median(seconds):6.1f}s")
+
+
+@app.local_entrypoint()
+def stream_chapter(
+    path: str = "manuscript-chapters/chapter_01.txt",
+    voice_name: str = "marco",
+    lang: str = "en",
+    output_dir: str = "/tmp/chatterbox-stream",
+):
+    """
+    Stream a chapter through generate_stream, saving each segment as it arrives
+    
+    Run with: modal run modal_chatterbox.py::stream_chapter --path manuscript-chapters/chapter_01.txt
+    """
+    import sys
+    
+    sys.path.insert(0, str(pathlib.Path(__file__).parent / "scripts"))
+    from audiobook.normalize import normalize_text
+    
+    output = pathlib.Path(output_dir)
+    output.mkdir(parents=True, exist_ok=True)
+    # Unwrap the manuscript's hard line breaks as the audiobook scripts do
+    text = normalize_text(pathlib.Path(path).read_text(encoding="utf-8"))
+    
+    start = time.perf_counter()
+    first = None
+    size = 0
+    for segment in ChatterboxTTS().generate_stream.remote_gen(text=text, voice_name=voice_name, lang=lang):
+        elapsed = time.perf_counter() - start
+        first = first if first is not None else elapsed
+        segment_path = output / f"segment_{segment['index']:03d}.flac"
+        segment_path.write_bytes(segment["audio"])
+        size += len(segment["audio"])
+        print(f"   {segment['index'] + 1}/{segment['count']} after {elapsed:6.1f}s "
+              f"({len(segment['text'])} chars, {segment['generation_seconds']:.1f}s in the model)")
+    total = time.perf_counter() - start
+    print(f"✅ First audio after {first:.1f}s, whole chapter after {total:.1f}s "
+          f"({size / 1024 / 1024:.1f} MB in {output})")
+
+
+@app.local_entrypoint()
+def fanout_book(
+    lang: str = "en",
+    chapters: str = "",
+    voice_name: str = "marco",
+    output_dir: str = "/tmp/chatterbox-fanout",
+    straggler_factor: float = 3.0,
+):
+    """
+    Synthesize every chunk of the selected chapters across all containers at once
+    
+    Chunks are spawned through ``audiobook.fanout`` (up to MAX_CONTAINERS x
+    MAX_INPUTS in flight) on ``generate_bytes_with_worker``, collected in
+    order, written as WAV files per chapter, and straggling calls are
+    re-submitted once the queue drains. The load report shows each
+    container's share.
+    
+    Run with: modal run modal_chatterbox.py::fanout_book --lang all --chapters 1-3
+    """
+    import sys
+    
+    sys.path.insert(0, str(pathlib.Path(__file__).parent / "scripts"))
+    from audiobook.cli import LANGUAGES, load_chapters
+    from audiobook.fanout import FanOutStats, ModalExecutor, fan_out
+    
+    languages = LANGUAGES if lang == "all" else (lang,)
+    items = [(chapter_lang, chapter_number, index, chunk)
+             for chapter_lang, chapter_number, chunks in load_chapters(languages, chapters, "chatterbox")
+             for index, chunk in enumerate(chunks)]
+    executor = ModalExecutor(
+        ChatterboxTTS().generate_bytes_with_worker,
+        workers=MAX_CONTAINERS * MAX_INPUTS,
+        kwargs=lambda item: {"text": item[3], "voice_name": voice_name, "audio_format": "wav"},
+        worker_of=lambda result: result[0],
+    )
+    print(f"Fanning out {len(items)} chunks, {executor.workers} at a time...")
+    
+    stats = FanOutStats()
+    output = pathlib.Path(output_dir)
+    for position, (_, audio) in fan_out(items, executor, size=lambda item: len(item[3]),
+                                        straggler_factor=straggler_factor or None, stats=stats):
+        chapter_lang, chapter_number, index, _ = items[position]
+        chapter_dir = output / chapter_lang / f"chapter_{chapter_number:02d}"
+        chapter_dir.mkdir(parents=True, exist_ok=True)
+        (chapter_dir / f"chunk_{index:03d}.wav").write_bytes(audio)
+    print(f"✅ {len(items)} chunks saved under {output}")
+    stats.report()
+
 
 @app.local_entrypoint()
 def test():
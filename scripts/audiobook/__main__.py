@@ -0,0 +1,14 @@
+"""
+Run the audiobook CLI as ``python scripts/audiobook ...`` or ``python -m audiobook ...``
+"""
+
+import sys
+from pathlib import Path
+
+if not __package__:
+    # Run as a directory: make the package importable from its parent
+    sys.path[0] = str(Path(__file__).resolve().parent.parent)
+
+from audiobook.cli import main
+
+sys.exit(main())
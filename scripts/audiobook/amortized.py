@@ -0,0 +1,35 @@
+"""
+Many texts per Chatterbox request
+
+ChatterboxTurboTTS has no batched forward pass: the model generates one
+text per call. What a multi-text request saves is the work around the model,
+amortized over every text in it: one Modal round trip instead of one per
+chunk, and one lookup of the voice's speaker conditioning. ``generate_many``
+is the model-side loop shared by ``ChatterboxTTS.generate_batch`` in
+modal_chatterbox.py and scripts/benchmark-chatterbox-batch.py.
+"""
+
+import time
+
+
+def generate_many(model, texts, conds, timings=None):
+    """
+    Generate each text in turn with one voice, returning waveforms in input order
+
+    Args:
+        model: ChatterboxTurboTTS, or anything with ``conds`` and ``generate(text)``
+        texts: Texts to synthesize
+        conds: Precomputed speaker conditionals for the voice
+        timings: Optional list that gets the seconds spent generating each text appended
+
+    Returns:
+        Whatever ``model.generate`` returns, one per text
+    """
+    model.conds = conds
+    results = []
+    for text in texts:
+        start = time.perf_counter()
+        results.append(model.generate(text))
+        if timings is not None:
+            timings.append(time.perf_counter() - start)
+    return results
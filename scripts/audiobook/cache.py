@@ -0,0 +1,134 @@
+"""
+Content-addressed on-disk cache for synthesized audio chunks
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+from audiobook.metrics import DEFAULT_METRICS
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "AUDIOBOOK_CACHE_DIR",
+    str(Path.home() / ".cache" / "destiny-hacking-audiobook" / "tts"),
+)
+DEFAULT_MAX_BYTES = int(float(os.environ.get("AUDIOBOOK_CACHE_MAX_MB", "2048")) * 1024 * 1024)
+
+
+def cache_key(text, voice_id, model_id, voice_settings, output_format):
+    """Hash everything that influences the synthesized audio"""
+    payload = json.dumps(
+        {
+            'text': text,
+            'voice_id': voice_id,
+            'model_id': model_id,
+            'voice_settings': voice_settings,
+            'output_format': output_format,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def settings_key(voice_id, model_id, voice_settings, output_format):
+    """Hash everything besides the text that influences the synthesized audio"""
+    return cache_key('', voice_id, model_id, voice_settings, output_format)
+
+
+class AudioCache:
+    """Size-bounded LRU cache of audio blobs keyed by content hash"""
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self.size = sum(path.stat().st_size for path in self._entries())
+
+    def _path(self, key):
+        return self.directory / key[:2] / f"{key}.bin"
+
+    def _entries(self):
+        return self.directory.glob("*/*.bin")
+
+    def get(self, key):
+        """Return cached audio for ``key`` or None, marking it recently used"""
+        path = self._path(key)
+        with DEFAULT_METRICS.timer('cache_read') as event:
+            try:
+                data = path.read_bytes()
+                os.utime(path)
+            except FileNotFoundError:
+                event['hit'] = False
+                with self.lock:
+                    self.misses += 1
+                return None
+            event.update(hit=True, bytes=len(data))
+        with self.lock:
+            self.hits += 1
+            self.bytes_saved += len(data)
+        return data
+
+    def put(self, key, data):
+        """Store audio for ``key`` and evict least recently used entries if over budget"""
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        with DEFAULT_METRICS.timer('cache_write', bytes=len(data)):
+            fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            self._commit(temp_path, path, len(data))
+
+    @contextmanager
+    def put_stream(self, key):
+        """Yield a file to stream audio into; it is stored under ``key`` only if the block succeeds"""
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                yield f
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        self._commit(temp_path, path, os.path.getsize(temp_path))
+
+    def _commit(self, temp_path, path, size):
+        previous = path.stat().st_size if path.exists() else 0
+        os.replace(temp_path, path)
+        with self.lock:
+            self.size += size - previous
+            if self.size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        entries = []
+        for path in self._entries():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        self.size = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if self.size <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            self.size -= size
+
+    def report(self):
+        """Print hit/miss statistics for this run"""
+        total = self.hits + self.misses
+        hit_rate = (self.hits / total * 100) if total else 0
+        print(f"🗄️  Audio cache: {self.hits} hits, {self.misses} misses ({hit_rate:.0f}% hit rate)")
+        print(f"   Saved {(self.bytes_saved / 1024 / 1024):.2f} MB of synthesis, "
+              f"cache size {(self.size / 1024 / 1024):.2f} MB at {self.directory}")
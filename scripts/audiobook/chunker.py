@@ -0,0 +1,275 @@
+"""
+Sentence-aware text chunker shared by the audiobook scripts
+
+Chunks are contiguous slices of the input, so no text is ever dropped: the
+spans returned by ``chunk_spans`` cover the whole text end to end. Splitting
+runs in a single pass over the text (plus a bounded look-back for
+abbreviations) and builds chunks from slices rather than by repeated string
+concatenation.
+"""
+
+import re
+
+DEFAULT_MAX_CHARS = 4500
+
+# Average narration speed, used to size chunks by estimated audio duration
+CHARS_PER_SECOND = {
+    'en': 15.0,
+    'pt': 14.0,
+}
+
+# Lower-cased words that end with a period without ending the sentence
+ABBREVIATIONS = {
+    'en': {
+        'mr', 'mrs', 'ms', 'dr', 'prof', 'sr', 'jr', 'st', 'mt', 'vs', 'etc', 'e.g', 'i.e', 'cf',
+        'no', 'vol', 'ch', 'fig', 'approx', 'a.m', 'p.m', 'u.s', 'inc', 'ltd', 'co',
+    },
+    'pt': {
+        'sr', 'sra', 'srta', 'dr', 'dra', 'prof', 'profa', 'sto', 'sta', 'etc', 'ex', 'p.ex', 'obs',
+        'cap', 'pág', 'pp', 'vol', 'nº', 'n', 'séc', 'av', 'a.c', 'd.c', 'i.e', 'e.g', 'cia', 'ltda',
+    },
+}
+
+# Abbreviations that are also ordinary words ("she said no."): they only count
+# when capitalized ("St. Paul", "Smith & Co.") or followed by a number ("no. 5")
+AMBIGUOUS_ABBREVIATIONS = {
+    'en': {'no', 'co', 'st'},
+    'pt': set(),
+}
+
+# Ambiguous abbreviations that capitalization does not settle, because the word
+# often starts a sentence ("Did you? No. I stayed."): only a number counts
+NUMBER_ABBREVIATIONS = {
+    'en': {'no'},
+    'pt': set(),
+}
+
+# The manuscripts are hard-wrapped at ~90 columns; a line at least this long
+# is wrapped prose, never a heading
+HEADING_MAX_CHARS = 70
+
+_BOUNDARY = re.compile(
+    r'(?P<para>\n[ \t]*\n\s*)'                       # paragraph break
+    r'|(?P<end>(?:\.{3}|[.!?…])+[)"\'”’»\]]*)(?=\s|$)'  # sentence-ending punctuation and closing quotes
+    r'|(?P<line>\n)'                                 # single line break (may end a heading)
+)
+_SENTENCE_END = '.!?…"\'”’»)'
+_TERMINAL = _SENTENCE_END + ':;,'
+_CLAUSE_BREAK = re.compile(r'[,;:—–)]\s')
+
+
+def estimate_seconds(text, lang='en'):
+    """Estimated narration time for ``text`` in seconds"""
+    return len(text) / CHARS_PER_SECOND.get(lang, CHARS_PER_SECOND['en'])
+
+
+def _is_abbreviation(text, end, abbreviations, ambiguous=frozenset(), numbered=frozenset()):
+    """True if the period at ``end - 1`` belongs to an abbreviation or an initial"""
+    start = end - 1
+    while start > 0 and not text[start - 1].isspace() and end - start < 12:
+        start -= 1
+    written = text[start:end - 1].lstrip('("\'“‘«[')
+    word = written.lower()
+    if not word:
+        return False
+    if len(word) == 1 and word.isalpha():
+        return True  # an initial such as "J."
+    if word in ambiguous:
+        following = text[end:end + 2].lstrip()
+        if following[:1].isdigit():
+            return True
+        return written[0].isupper() and word not in numbered
+    return word in abbreviations
+
+
+def _starts_sentence(text, position):
+    """True if the next non-space character after ``position`` can start a sentence"""
+    length = len(text)
+    while position < length and text[position].isspace():
+        position += 1
+    if position >= length:
+        return True
+    char = text[position]
+    return not char.islower()
+
+
+def sentence_spans(text, lang='en'):
+    """
+    Split ``text`` into contiguous ``(start, end)`` sentence spans covering all of it
+
+    Boundaries fall after terminal punctuation (including ellipses and any
+    closing quotes) when the next word starts a sentence, at paragraph
+    breaks, and after heading lines: short unpunctuated lines that follow a
+    blank line, a finished sentence or another heading line and are not
+    followed by a lower-case continuation.
+    """
+    abbreviations = ABBREVIATIONS.get(lang, ABBREVIATIONS['en'])
+    ambiguous = AMBIGUOUS_ABBREVIATIONS.get(lang, AMBIGUOUS_ABBREVIATIONS['en'])
+    numbered = NUMBER_ABBREVIATIONS.get(lang, NUMBER_ABBREVIATIONS['en'])
+    spans = []
+    start = 0
+    line_start = 0
+    previous_line_closed = True
+
+    for match in _BOUNDARY.finditer(text):
+        kind = match.lastgroup
+        boundary = None
+        if kind == 'para':
+            boundary = match.end()
+            line_start = match.end()
+            previous_line_closed = True
+        elif kind == 'line':
+            line = text[line_start:match.start()].strip()
+            is_heading = (
+                bool(line)
+                and len(line) < HEADING_MAX_CHARS
+                and line[-1] not in _TERMINAL
+                and previous_line_closed
+                and _starts_sentence(text, match.end())
+            )
+            if is_heading:
+                boundary = match.end()
+            line_start = match.end()
+            previous_line_closed = not line or is_heading or line[-1] in _SENTENCE_END
+        else:
+            punctuation = match.group('end')
+            if punctuation.rstrip(')"\'”’»]').endswith('.') and not punctuation.startswith('..') \
+                    and _is_abbreviation(text, match.start() + 1, abbreviations, ambiguous, numbered):
+                continue
+            if _starts_sentence(text, match.end()):
+                boundary = match.end()
+
+        if boundary is not None and boundary > start:
+            spans.append((start, boundary))
+            start = boundary
+
+    if start < len(text):
+        spans.append((start, len(text)))
+    return spans
+
+
+def _split_long(text, start, end, limit):
+    """Split one over-long span at clause breaks, then whitespace, then hard cuts"""
+    pieces = []
+    while end - start > limit:
+        window_end = start + limit
+        cut = None
+        for match in _CLAUSE_BREAK.finditer(text, start + limit // 2, window_end):
+            cut = match.end()
+        if cut is None:
+            space = text.rfind(' ', start + limit // 2, window_end)
+            cut = space + 1 if space != -1 else window_end
+        pieces.append((start, cut))
+        start = cut
+    pieces.append((start, end))
+    return pieces
+
+
+def chunk_spans(text, max_chars=DEFAULT_MAX_CHARS, max_seconds=None, lang='en'):
+    """
+    Pack sentences into ``(start, end)`` chunk spans that cover all of ``text``
+
+    Args:
+        text: Text to split
+        max_chars: Maximum characters per chunk
+        max_seconds: Optional maximum estimated audio seconds per chunk
+        lang: 'en' or 'pt', selects abbreviations and narration speed
+
+    Returns:
+        Contiguous spans; each is at most the size limit
+    """
+    limit = max_chars
+    if max_seconds is not None:
+        limit = min(limit, int(max_seconds * CHARS_PER_SECOND.get(lang, CHARS_PER_SECOND['en'])))
+    limit = max(1, limit)
+
+    chunks = []
+    chunk_start = 0
+    chunk_end = 0
+    for start, end in sentence_spans(text, lang):
+        if end - start > limit:
+            if chunk_end > chunk_start:
+                chunks.append((chunk_start, chunk_end))
+            pieces = _split_long(text, start, end, limit)
+            chunks.extend(pieces[:-1])
+            chunk_start, chunk_end = pieces[-1]
+            continue
+        if end - chunk_start > limit and chunk_end > chunk_start:
+            chunks.append((chunk_start, chunk_end))
+            chunk_start = start
+        chunk_end = end
+    if chunk_end > chunk_start:
+        chunks.append((chunk_start, chunk_end))
+    return chunks
+
+
+def chunk_text(text, max_chars=DEFAULT_MAX_CHARS, max_seconds=None, lang='en'):
+    """Split text into sentence-aware chunks, dropping only surrounding whitespace"""
+    chunks = []
+    for start, end in chunk_spans(text, max_chars, max_seconds, lang):
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+    return chunks
+
+
+def _at_boundary(text, start, end):
+    return (start == 0 or text[start - 1].isspace()) and (end == len(text) or text[end].isspace())
+
+
+def rechunk(previous, text, max_chars=DEFAULT_MAX_CHARS, max_seconds=None, lang='en'):
+    """
+    Chunk an edited text, keeping the chunks of a previous render that are still in it
+
+    Each previous chunk is looked for in order after the end of the last one
+    found; the stretches of ``text`` between matches (edited, added or
+    removed passages) are chunked afresh. Unchanged chunks therefore keep
+    their exact text, and with it their cached audio, however the rest of
+    the chapter moved around them.
+
+    Args:
+        previous: Chunks of the previous render, in order
+        text: New text to split
+        max_chars, max_seconds, lang: As for ``chunk_text``
+
+    Returns:
+        Chunks covering ``text``, reusing as many previous chunks as possible
+    """
+    limit = max_chars
+    if max_seconds is not None:
+        limit = min(limit, int(max_seconds * CHARS_PER_SECOND.get(lang, CHARS_PER_SECOND['en'])))
+    chunks = []
+    position = 0
+    for chunk in previous:
+        if not chunk or len(chunk) > limit:
+            continue
+        found = text.find(chunk, position)
+        # Only whole sentences count: the match must not start or end inside a word
+        while found != -1 and not _at_boundary(text, found, found + len(chunk)):
+            found = text.find(chunk, found + 1)
+        if found == -1:
+            continue
+        chunks.extend(chunk_text(text[position:found], max_chars, max_seconds, lang))
+        chunks.append(chunk)
+        position = found + len(chunk)
+    chunks.extend(chunk_text(text[position:], max_chars, max_seconds, lang))
+    return chunks
+
+
+def locate_chunks(text, chunks):
+    """
+    ``(start, end)`` offsets of each chunk in ``text``, or None for a chunk not found
+
+    Chunks are looked for in order, each after the end of the previous one,
+    which is how ``chunk_text`` and ``rechunk`` cut them.
+    """
+    spans = []
+    position = 0
+    for chunk in chunks:
+        found = text.find(chunk, position)
+        if found == -1:
+            spans.append(None)
+            continue
+        spans.append((found, found + len(chunk)))
+        position = found + len(chunk)
+    return spans
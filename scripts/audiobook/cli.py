@@ -0,0 +1,292 @@
+"""
+Command-line entry point for generating the audiobook
+
+    python scripts/audiobook
+    python scripts/audiobook --lang pt --chapters 6-14
+    python scripts/audiobook --provider chatterbox --concurrency 8
+    python scripts/audiobook --lang en --chapters 1-3,12 --dry-run
+    python scripts/audiobook --voice en=<voice id> --voice pt=<voice id>
+    python scripts/audiobook --lang en --incremental
+
+By default both manuscripts are rendered in one run. All selected chapters,
+in every selected language, are chunked up front and generated through one
+``BookScheduler`` queue, so the languages share the concurrency quota, the
+rate limiter, the HTTP connection pool and the audio cache, and the book
+takes about as long as its total amount of text rather than one language's
+render followed by the other's. Each chapter MP3 is written
+with a ``.index.json`` sidecar (see ``audiobook.index``). Provider clients are
+imported only when audio is actually generated.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from audiobook.cache import AudioCache
+from audiobook.chunker import chunk_text, rechunk
+from audiobook.estimate import estimate_book, record_run
+from audiobook.index import load_index, reusable_ranges
+from audiobook.manifest import DEFAULT_WORK_DIR, JobManifest
+from audiobook.metrics import DEFAULT_METRICS
+from audiobook.normalize import available_chapters, chapter_path, load_normalized
+from audiobook.providers import DEFAULT_VOICES, MAX_CHARS, PROVIDERS, get_synthesizer, synthesis_key
+from audiobook.scheduler import BookScheduler, ChapterJob, format_duration
+from audiobook.synthesis import DEFAULT_CONCURRENCY, rate_limiter_for_quota
+
+LANGUAGES = ('en', 'pt')
+DEFAULT_OUTPUT_DIR = "/tmp"
+
+
+def parse_chapters(spec, available):
+    """
+    Chapter numbers selected by a spec such as '6-14' or '1-3,8,12-14'
+
+    An empty spec selects every available chapter.
+    """
+    if not spec:
+        return list(available)
+    selected = set()
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        first, _, last = part.partition('-')
+        try:
+            start = int(first)
+            end = int(last) if last else start
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid chapter range: {part!r}")
+        if start > end:
+            raise argparse.ArgumentTypeError(f"invalid chapter range: {part!r}")
+        selected.update(range(start, end + 1))
+    missing = sorted(selected - set(available))
+    if missing:
+        raise argparse.ArgumentTypeError(f"no manuscript for chapters {missing}")
+    return sorted(selected)
+
+
+def output_path(output_dir, lang, provider, chapter_number):
+    """Chapter MP3 path, using the names the upload scripts expect for ElevenLabs output"""
+    number = str(chapter_number).zfill(2)
+    if provider == 'chatterbox':
+        name = f"chapter_{number}_{lang}_chatterbox.mp3"
+    elif lang == 'en':
+        name = f"chapter_{number}_elevenlabs.mp3"
+    else:
+        name = f"chapter_{number}_{lang}.mp3"
+    return str(Path(output_dir) / name)
+
+
+def load_chapters(languages, spec, provider, previous=None):
+    """
+    Normalize and chunk every selected chapter as ``(lang, chapter_number, chunks)``
+
+    ``previous`` is an optional callable ``(lang, chapter_number)`` returning
+    the chunks of the last render; chapters that have them are re-chunked
+    around the unchanged ones.
+    """
+    chapters = []
+    for lang in languages:
+        for chapter_number in parse_chapters(spec, available_chapters(lang)):
+            text = load_normalized(chapter_path(lang, chapter_number))
+            previous_chunks = previous(lang, chapter_number) if previous else None
+            if previous_chunks:
+                chunks = rechunk(previous_chunks, text, max_chars=MAX_CHARS[provider], lang=lang)
+            else:
+                chunks = chunk_text(text, max_chars=MAX_CHARS[provider], lang=lang)
+            print(f"📄 {lang}/{str(chapter_number).zfill(2)}: {len(text)} characters, {len(chunks)} chunks")
+            chapters.append((lang, chapter_number, chunks))
+    return chapters
+
+
+def parse_voices(values, provider, languages):
+    """
+    Voice for each language from ``--voice`` values
+
+    Each value is either a voice for every language or ``lang=voice`` for
+    one; languages without one use the provider's default voice.
+    """
+    voices = {lang: DEFAULT_VOICES[provider] for lang in languages}
+    for value in values or []:
+        lang, separator, voice = value.partition('=')
+        if not separator:
+            voices = {lang: value for lang in languages}
+        elif lang not in LANGUAGES:
+            raise argparse.ArgumentTypeError(f"unknown language in --voice {value!r}")
+        elif lang in voices:
+            voices[lang] = voice
+    return voices
+
+
+def print_estimate(chapters, provider, concurrency):
+    estimate = estimate_book(chapters, provider, concurrency)
+    print("=" * 60)
+    print(f"🧮 Dry run: {len(chapters)} chapters with {provider} at concurrency {concurrency}")
+    print(f"   {estimate['calibration'].describe()}")
+    print()
+    print(f"   {'Chapter':<8} {'Chars':>8} {'Requests':>8} {'Audio':>8} {'Done at':>8} {'Cost':>8}")
+    for row in estimate['chapters']:
+        print(f"   {row['lang']}/{str(row['chapter']).zfill(2):<5} {row['chars']:>8,} {row['requests']:>8} "
+              f"{format_duration(row['audio_seconds']):>8} {format_duration(row['finish_seconds']):>8} "
+              f"{'$' + format(row['cost_usd'], '.2f'):>8}")
+    print()
+    print(f"   Characters: {estimate['chars']:,}")
+    print(f"   Requests:   {estimate['requests']}")
+    print(f"   Audio:      {format_duration(estimate['audio_seconds'])}")
+    print(f"   Wall time:  {format_duration(estimate['wall_seconds'])}")
+    languages = sorted({lang for lang, _, _ in chapters})
+    if len(languages) > 1:
+        # What rendering the languages one after another, as separate runs, would take
+        one_by_one = sum(estimate_book([chapter for chapter in chapters if chapter[0] == lang], provider,
+                                       concurrency, estimate['calibration'])['wall_seconds']
+                         for lang in languages)
+        print(f"               ({format_duration(one_by_one)} one language after another)")
+    print(f"   Cost:       ${estimate['cost_usd']:.2f}")
+    print("=" * 60)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="audiobook", description="Generate Destiny Hacking audiobook chapters")
+    parser.add_argument('--lang', choices=LANGUAGES + ('all',), default='all',
+                        help="manuscript language (default: all, rendering both in one run)")
+    parser.add_argument('--chapters', default="",
+                        help="chapters to generate, e.g. '6-14' or '1-3,8' (default: all)")
+    parser.add_argument('--provider', choices=PROVIDERS, default='elevenlabs')
+    parser.add_argument('--voice', action='append',
+                        help="voice ID (ElevenLabs) or voice name (Chatterbox), or lang=voice to set one "
+                             "language's voice; may be repeated")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"requests in flight at once (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR,
+                        help=f"where chapter MP3s are written (default: {DEFAULT_OUTPUT_DIR})")
+    parser.add_argument('--resume', action='store_true',
+                        help="continue from the job manifest, skipping finished chapters and chunks")
+    parser.add_argument('--incremental', action='store_true',
+                        help="after editing the manuscript, synthesize only the chunks whose text changed "
+                             "and splice the rest from the previous chapter files")
+    parser.add_argument('--stream', action='store_true',
+                        help="ElevenLabs only: write audio to disk as it arrives")
+    parser.add_argument('--metrics',
+                        help="JSON-lines file for per-operation timings (default: a new file per run "
+                             "under the work directory)")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="only estimate characters, requests, cost and time")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.stream and args.provider != 'elevenlabs':
+        parser.error("--stream is only supported by the elevenlabs provider")
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    languages = LANGUAGES if args.lang == 'all' else (args.lang,)
+    # Chatterbox chunks are smaller and sound different, so they never mix with ElevenLabs ones
+    work_dir = DEFAULT_WORK_DIR if args.provider == 'elevenlabs' else Path(DEFAULT_WORK_DIR) / args.provider
+
+    manifests = None
+    previous = None
+    try:
+        voices = parse_voices(args.voice, args.provider, languages)
+        if args.incremental:
+            manifests = {lang: JobManifest(lang, work_dir=work_dir, settings=synthesis_key(args.provider, voices[lang]))
+                         for lang in languages}
+            previous = lambda lang, chapter_number: manifests[lang].chunk_texts(chapter_number)
+        chapters = load_chapters(languages, args.chapters, args.provider, previous=previous)
+    except argparse.ArgumentTypeError as error:
+        parser.error(str(error))
+
+    if args.dry_run:
+        if args.incremental:
+            print("🧩 Incremental: only chunks without audio from an earlier render are counted")
+            pending = []
+            for lang, chapter_number, chunks in chapters:
+                ranges = reusable_ranges(output_path(args.output_dir, lang, args.provider, chapter_number), chunks,
+                                         manifests[lang].settings)
+                indices = [index for index in manifests[lang].pending_chunks(chapter_number, chunks)
+                           if index not in ranges]
+                if indices:
+                    pending.append((lang, chapter_number, [chunks[i] for i in indices]))
+            chapters = pending
+        print_estimate(chapters, args.provider, args.concurrency)
+        return 0
+
+    if args.provider == 'elevenlabs':
+        from audiobook import session
+        from audiobook.elevenlabs import ELEVENLABS_API_KEY
+        if not ELEVENLABS_API_KEY:
+            print("❌ ELEVENLABS_API_KEY not found in environment")
+            return 1
+        session.configure(args.concurrency)
+
+    print(f"🚀 Generating {len(chapters)} chapters with {args.provider}")
+    print("=" * 60)
+
+    audio_cache = AudioCache()
+    # One synthesizer per distinct voice; all of them share the cache and the HTTP pool
+    synthesizers = {}
+    for voice in voices.values():
+        if voice not in synthesizers:
+            synthesizers[voice] = get_synthesizer(args.provider, voice, cache=audio_cache, stream=args.stream)
+    if manifests is None:
+        manifests = {lang: JobManifest(lang, work_dir=work_dir, resume=args.resume,
+                                       settings=synthesis_key(args.provider, voices[lang]))
+                     for lang in languages}
+    for manifest in manifests.values():
+        print(f"📒 Job manifest: {manifest.path}{' (resuming)' if args.resume or args.incremental else ''}")
+
+    Path(args.output_dir).mkdir(parents=True, exist_ok=True)
+    scheduler = BookScheduler(concurrency=args.concurrency, rate_limiter=rate_limiter_for_quota(args.concurrency))
+    for lang, chapter_number, chunks in chapters:
+        manifest = manifests[lang]
+        path = output_path(args.output_dir, lang, args.provider, chapter_number)
+        # A chapter rendered before it had an index is reassembled once, without new requests
+        if (args.incremental and manifest.is_chapter_current(chapter_number, chunks)
+                and load_index(path) is not None):
+            print(f"⏭️  Chapter {lang}/{str(chapter_number).zfill(2)} unchanged")
+            continue
+        if args.resume and manifest.is_chapter_complete(chapter_number):
+            print(f"⏭️  Chapter {lang}/{str(chapter_number).zfill(2)} already complete")
+            continue
+        text = load_normalized(chapter_path(lang, chapter_number))
+        scheduler.add(ChapterJob(manifest, chapter_number, chunks, synthesizers[voices[lang]], path,
+                                 stream=args.stream, text=text, incremental=args.incremental))
+
+    metrics_path = args.metrics or Path(DEFAULT_WORK_DIR) / "metrics" / time.strftime("run-%Y%m%d-%H%M%S.jsonl")
+    DEFAULT_METRICS.open(metrics_path)
+    start_time = time.time()
+    print(f"🎙️  Generating audio ({args.concurrency} chunks at a time, shortest chapters first)...")
+    completed, failed = scheduler.run()
+    record_run(args.provider, args.concurrency, scheduler.jobs, time.time() - start_time)
+
+    print("=" * 60)
+    print("🎉 Audiobook generation complete!")
+    print(f"⏱️  Total time: {format_duration(time.time() - start_time)}")
+    print(f"✅ Completed: {len(completed)} chapters")
+    print(f"❌ Failed: {len(failed)} chapters")
+    if failed:
+        print(f"   Failed chapters: {sorted(job.label for job, _ in failed)}")
+        print("   Finished chunks are kept; rerun with --resume to continue")
+    for lang in languages:
+        jobs = [job for job, _ in completed if job.manifest.language == lang]
+        if len(languages) > 1 and jobs:
+            print(f"🌐 {lang}: {len(jobs)} chapters, {format_duration(sum(job.writer.duration for job in jobs))} "
+                  f"of audio, last finished after {format_duration(max(job.finished_seconds for job in jobs))}")
+    audio_cache.report()
+    if args.provider == 'elevenlabs':
+        from audiobook.retry import DEFAULT_POLICY
+        DEFAULT_POLICY.report()
+    DEFAULT_METRICS.report()
+    DEFAULT_METRICS.close()
+    print("=" * 60)
+
+    print("\n📁 Generated files:")
+    for job, path in sorted(completed, key=lambda item: item[0].label):
+        print(f"   {job.label}: {path}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
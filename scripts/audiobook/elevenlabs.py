@@ -0,0 +1,166 @@
+"""
+ElevenLabs text-to-speech client shared by the audiobook scripts
+
+Set ELEVENLABS_API_BASE to point the client at a local stand-in server
+(see ``audiobook.stub_server``) instead of the real API.
+"""
+
+import os
+import time
+
+from audiobook.cache import cache_key
+from audiobook.metrics import DEFAULT_METRICS
+from audiobook.retry import DEFAULT_POLICY, raise_for_response
+from audiobook.session import TIMEOUT, get_session
+from audiobook.synthesis import before_request
+
+ELEVENLABS_API_KEY = os.environ.get("ELEVENLABS_API_KEY")
+ELEVENLABS_API_BASE = os.environ.get("ELEVENLABS_API_BASE", "https://api.elevenlabs.io")
+
+MODEL_ID = 'eleven_multilingual_v2'  # Supports English and Portuguese
+OUTPUT_FORMAT = 'mp3_44100_128'
+VOICE_SETTINGS = {
+    'stability': 0.5,
+    'similarity_boost': 0.75
+}
+STREAM_CHUNK_SIZE = 16 * 1024
+
+
+def _request(voice_id, text, model_id, voice_settings, output_format, stream=False):
+    """Send one synthesis request, raising a classified TTSError on failure"""
+    headers = {
+        'xi-api-key': ELEVENLABS_API_KEY,
+        'Content-Type': 'application/json',
+        'Accept': 'audio/mpeg'
+    }
+    
+    data = {
+        'text': text,
+        'model_id': model_id,
+        'voice_settings': voice_settings
+    }
+    
+    endpoint = f"/v1/text-to-speech/{voice_id}/stream" if stream else f"/v1/text-to-speech/{voice_id}"
+    response = get_session().post(
+        f"{ELEVENLABS_API_BASE}{endpoint}?output_format={output_format}",
+        headers=headers,
+        json=data,
+        timeout=TIMEOUT,
+        stream=stream
+    )
+    
+    try:
+        raise_for_response(response)
+    except Exception:
+        response.close()
+        raise
+    
+    return response
+
+
+def _counted_request(event, *args, **kwargs):
+    """``_request`` that counts retries into a metrics event and waits for the rate limiter"""
+    event['retries'] = event.get('retries', -1) + 1
+    # The wait is recorded as rate_wait, not as request latency
+    event['excluded_seconds'] = event.get('excluded_seconds', 0.0) + before_request()
+    return _request(*args, **kwargs)
+
+
+def generate_speech(voice_id, text, cache=None, model_id=MODEL_ID, voice_settings=VOICE_SETTINGS,
+                    output_format=OUTPUT_FORMAT, retry_policy=DEFAULT_POLICY):
+    """Generate speech from text using cloned voice, consulting ``cache`` first"""
+    key = None
+    if cache is not None:
+        key = cache_key(text, voice_id, model_id, voice_settings, output_format)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+    
+    with DEFAULT_METRICS.timer('http', chars=len(text)) as event:
+        response = retry_policy.call(_counted_request, event, voice_id, text, model_id, voice_settings,
+                                     output_format)
+        content = response.content
+        event['bytes'] = len(content)
+    
+    if cache is not None:
+        cache.put(key, content)
+    return content
+
+
+def stream_speech(voice_id, text, output, cache=None, model_id=MODEL_ID, voice_settings=VOICE_SETTINGS,
+                  output_format=OUTPUT_FORMAT, chunk_size=STREAM_CHUNK_SIZE, retry_policy=DEFAULT_POLICY):
+    """
+    Generate speech with the streaming endpoint, writing audio to ``output`` as it arrives
+
+    Args:
+        voice_id: ElevenLabs voice ID
+        text: Text to synthesize
+        output: Binary file-like object to write MP3 data into
+        cache: Optional AudioCache; hits are written out directly and misses are
+            streamed into the cache alongside ``output``
+        retry_policy: Retries apply until the response starts; a failure mid-stream
+            is raised so the caller can discard the partial output
+
+    Returns:
+        Number of bytes written
+    """
+    key = None
+    if cache is not None:
+        key = cache_key(text, voice_id, model_id, voice_settings, output_format)
+        cached = cache.get(key)
+        if cached is not None:
+            output.write(cached)
+            return len(cached)
+    
+    with DEFAULT_METRICS.timer('http_stream', chars=len(text)) as event:
+        start = time.monotonic()
+        response = retry_policy.call(_counted_request, event, voice_id, text, model_id, voice_settings,
+                                     output_format, stream=True)
+        event['first_byte'] = round(time.monotonic() - start - event.get('excluded_seconds', 0.0), 4)
+        
+        def copy(targets):
+            written = 0
+            with response:
+                for block in response.iter_content(chunk_size=chunk_size):
+                    for target in targets:
+                        target.write(block)
+                    written += len(block)
+            event['bytes'] = written
+            return written
+        
+        if cache is None:
+            return copy([output])
+        with cache.put_stream(key) as cache_file:
+            return copy([output, cache_file])
+
+
+def clone_voice(name, audio_path, description='Author voice for Destiny Hacking audiobook'):
+    """Clone a voice from an audio sample and return its voice ID"""
+    print(f"🎤 Cloning voice '{name}' from {audio_path}...")
+    
+    with open(audio_path, 'rb') as audio_file:
+        files = {
+            'files': ('voice_sample.wav', audio_file, 'audio/wav')
+        }
+        data = {
+            'name': name,
+            'description': description
+        }
+        headers = {
+            'xi-api-key': ELEVENLABS_API_KEY
+        }
+        
+        response = get_session().post(
+            f"{ELEVENLABS_API_BASE}/v1/voices/add",
+            headers=headers,
+            data=data,
+            files=files,
+            timeout=TIMEOUT
+        )
+        
+        if not response.ok:
+            raise Exception(f"Voice cloning failed: {response.status_code} {response.text}")
+        
+        voice_id = response.json()['voice_id']
+        print(f"✅ Voice cloned successfully! Voice ID: {voice_id}")
+        return voice_id
@@ -0,0 +1,269 @@
+"""
+Up-front estimate of what a book render will cost and how long it will take
+
+Used by ``--dry-run``: it only needs the chunked text, so nothing here
+imports a TTS client. Every real run appends its measured request times,
+chapter audio lengths and wall-clock time to a JSON-lines history file, and
+estimates are calibrated from the most recent runs of the same provider:
+
+- request time is fitted as ``overhead + characters / chars_per_second``
+- narration speed (characters per audio second) is measured per language
+- wall time comes from replaying the scheduler's shortest-chapter-first
+  order over ``concurrency`` workers, scaled by how much slower past runs
+  were than that replay (rate limiting, retries, assembly)
+
+Without history the defaults below are used.
+"""
+
+import heapq
+import json
+import os
+import statistics
+import time
+from pathlib import Path
+
+from audiobook.chunker import CHARS_PER_SECOND
+from audiobook.manifest import DEFAULT_WORK_DIR
+
+# ElevenLabs bills per character; Chatterbox runs on a Modal GPU billed per second
+ELEVENLABS_USD_PER_1K_CHARS = float(os.environ.get("ELEVENLABS_USD_PER_1K_CHARS", "0.30"))
+CHATTERBOX_USD_PER_GPU_HOUR = float(os.environ.get("CHATTERBOX_USD_PER_GPU_HOUR", "0.59"))  # T4
+
+# Characters one in-flight request turns into audio per second, and the fixed
+# cost of each request (round trip, queueing, model warm-up)
+REQUEST_CHARS_PER_SECOND = {
+    'elevenlabs': 250.0,
+    'chatterbox': 60.0,
+}
+REQUEST_OVERHEAD_SECONDS = {
+    'elevenlabs': 1.0,
+    'chatterbox': 0.5,
+}
+
+DEFAULT_HISTORY_PATH = Path(os.environ.get("AUDIOBOOK_HISTORY", str(Path(DEFAULT_WORK_DIR) / "history.jsonl")))
+# Only the most recent runs are used, so estimates follow API and tier changes
+HISTORY_RUNS = int(os.environ.get("AUDIOBOOK_HISTORY_RUNS", "20"))
+# Faster than this, a "request" was answered from the audio cache
+MIN_REQUEST_SECONDS = 0.1
+
+
+def simulate_wall_seconds(chapters, concurrency):
+    """
+    Replay the book scheduler over known request durations
+
+    Args:
+        chapters: List of per-chapter lists of ``(characters, seconds)`` requests
+        concurrency: Number of workers
+
+    Returns:
+        (makespan, finish): total seconds and each chapter's finish time
+    """
+    pending = [list(requests) for requests in chapters]
+    remaining = [sum(chars for chars, _ in requests) for requests in chapters]
+    finish = [0.0] * len(chapters)
+    workers = [0.0] * max(1, concurrency)
+    while True:
+        candidates = [i for i, requests in enumerate(pending) if requests]
+        if not candidates:
+            break
+        chapter = min(candidates, key=lambda i: remaining[i])
+        chars, seconds = pending[chapter].pop(0)
+        remaining[chapter] -= chars
+        start = heapq.heappop(workers)
+        heapq.heappush(workers, start + seconds)
+        finish[chapter] = max(finish[chapter], start + seconds)
+    return max(finish, default=0.0), finish
+
+
+def _fit_requests(samples, provider):
+    """Least-squares fit of ``seconds = overhead + chars / rate`` to ``(chars, seconds)`` samples"""
+    default_overhead = REQUEST_OVERHEAD_SECONDS[provider]
+    if not samples:
+        return default_overhead, REQUEST_CHARS_PER_SECOND[provider]
+    mean_x = statistics.fmean(chars for chars, _ in samples)
+    mean_y = statistics.fmean(seconds for _, seconds in samples)
+    variance = sum((chars - mean_x) ** 2 for chars, _ in samples)
+    if variance > 0:
+        slope = sum((chars - mean_x) * (seconds - mean_y) for chars, seconds in samples) / variance
+        overhead = mean_y - slope * mean_x
+        if slope > 0 and overhead >= 0:
+            return overhead, 1 / slope
+    # Too few distinct chunk sizes to separate the two costs: keep the default overhead
+    busy = sum(seconds for _, seconds in samples) - default_overhead * len(samples)
+    chars = sum(chars for chars, _ in samples)
+    if busy <= 0:
+        return 0.0, chars / sum(seconds for _, seconds in samples)
+    return default_overhead, chars / busy
+
+
+class Calibration:
+    """
+    Per-provider speed model, either defaults or fitted from previous runs
+
+    Attributes:
+        overhead: Fixed seconds per request
+        chars_per_second: Characters per second of request time after the overhead
+        narration: Characters per second of audio, per language
+        slowdown: Measured wall time divided by the scheduler replay
+        runs, requests: How much history the model is based on
+    """
+
+    def __init__(self, provider):
+        self.provider = provider
+        self.overhead = REQUEST_OVERHEAD_SECONDS[provider]
+        self.chars_per_second = REQUEST_CHARS_PER_SECOND[provider]
+        self.narration = dict(CHARS_PER_SECOND)
+        self.slowdown = 1.0
+        self.runs = 0
+        self.requests = 0
+
+    @classmethod
+    def from_history(cls, provider, path=DEFAULT_HISTORY_PATH, max_runs=HISTORY_RUNS):
+        calibration = cls(provider)
+        runs = [run for run in load_history(path) if run.get('provider') == provider][-max_runs:]
+        if not runs:
+            return calibration
+
+        samples = [(chars, seconds) for run in runs for chars, seconds in run['requests']
+                   if seconds >= MIN_REQUEST_SECONDS]
+        calibration.overhead, calibration.chars_per_second = _fit_requests(samples, provider)
+        calibration.runs = len(runs)
+        calibration.requests = len(samples)
+
+        for lang in CHARS_PER_SECOND:
+            chapters = [chapter for run in runs for chapter in run['chapters']
+                        if chapter['lang'] == lang and chapter['audio_seconds'] > 0]
+            if chapters:
+                calibration.narration[lang] = (sum(chapter['chars'] for chapter in chapters)
+                                               / sum(chapter['audio_seconds'] for chapter in chapters))
+
+        ratios = [run['wall_seconds'] / run['simulated_seconds'] for run in runs
+                  if run.get('simulated_seconds', 0) > 0]
+        if ratios:
+            calibration.slowdown = max(1.0, statistics.median(ratios))
+        return calibration
+
+    def request_seconds(self, chars):
+        """Expected time for one synthesis request"""
+        return self.overhead + chars / self.chars_per_second
+
+    def audio_seconds(self, chars, lang):
+        return chars / self.narration.get(lang, self.narration['en'])
+
+    def describe(self):
+        if not self.runs:
+            return "default speeds (no previous runs recorded)"
+        runs = f"{self.runs} previous run{'s' if self.runs != 1 else ''}"
+        return (f"calibrated from {runs} ({self.requests} requests): "
+                f"{self.overhead:.1f}s + {self.chars_per_second:.0f} chars/s per request, "
+                f"{self.slowdown:.2f}x scheduling overhead")
+
+
+def request_cost(provider, chars, seconds):
+    """Price in USD of one request"""
+    if provider == 'elevenlabs':
+        return chars / 1000 * ELEVENLABS_USD_PER_1K_CHARS
+    return seconds / 3600 * CHATTERBOX_USD_PER_GPU_HOUR
+
+
+def estimate_book(chapters, provider, concurrency, calibration=None):
+    """
+    Estimate a render of the given chapters
+
+    Args:
+        chapters: List of ``(lang, chapter_number, chunks)``
+        provider: 'elevenlabs' or 'chatterbox'
+        concurrency: Requests in flight at once
+        calibration: Calibration to use (default: from the run history)
+
+    Returns:
+        Dict with a 'chapters' list (lang, chapter, chars, requests,
+        audio_seconds, request_seconds, finish_seconds, cost_usd per chapter),
+        the totals chars, requests, audio_seconds, request_seconds,
+        wall_seconds and cost_usd, and the 'calibration' used
+    """
+    if calibration is None:
+        calibration = Calibration.from_history(provider)
+    rows = []
+    schedule = []
+    for lang, chapter_number, chunks in chapters:
+        requests = [(len(chunk), calibration.request_seconds(len(chunk))) for chunk in chunks]
+        chars = sum(chars for chars, _ in requests)
+        rows.append({
+            'lang': lang,
+            'chapter': chapter_number,
+            'chars': chars,
+            'requests': len(requests),
+            'audio_seconds': calibration.audio_seconds(chars, lang),
+            'request_seconds': sum(seconds for _, seconds in requests),
+            'cost_usd': sum(request_cost(provider, chars, seconds) for chars, seconds in requests),
+        })
+        schedule.append(requests)
+
+    makespan, finish = simulate_wall_seconds(schedule, concurrency)
+    for row, finished in zip(rows, finish):
+        row['finish_seconds'] = finished * calibration.slowdown
+    return {
+        'chapters': rows,
+        'chars': sum(row['chars'] for row in rows),
+        'requests': sum(row['requests'] for row in rows),
+        'audio_seconds': sum(row['audio_seconds'] for row in rows),
+        'request_seconds': sum(row['request_seconds'] for row in rows),
+        'wall_seconds': makespan * calibration.slowdown,
+        'cost_usd': sum(row['cost_usd'] for row in rows),
+        'calibration': calibration,
+    }
+
+
+def load_history(path=DEFAULT_HISTORY_PATH):
+    """Recorded runs, oldest first; unreadable lines are skipped"""
+    path = Path(path)
+    if not path.exists():
+        return []
+    runs = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                runs.append(json.loads(line))
+            except ValueError:
+                continue
+    return runs
+
+
+def record_run(provider, concurrency, jobs, wall_seconds, path=DEFAULT_HISTORY_PATH):
+    """
+    Append one run's measurements to the history file
+
+    Args:
+        provider: Provider used for the run
+        concurrency: Requests in flight at once
+        jobs: Finished ``ChapterJob`` objects; their ``timings`` give request
+            times and completed chapters their audio duration
+        wall_seconds: Wall-clock time of the whole run
+    """
+    requests = [[chars, round(seconds, 3)] for job in jobs for chars, seconds in job.timings]
+    if not requests:
+        return
+    simulated, _ = simulate_wall_seconds([job.timings for job in jobs], concurrency)
+    chapters = [
+        {
+            'lang': job.manifest.language,
+            'chapter': job.chapter_number,
+            'chars': sum(len(chunk) for chunk in job.chunks),
+            'audio_seconds': round(job.writer.duration, 2),
+        }
+        for job in jobs if job.finished and job.error is None
+    ]
+    record = {
+        'time': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'provider': provider,
+        'concurrency': concurrency,
+        'wall_seconds': round(wall_seconds, 2),
+        'simulated_seconds': round(simulated, 2),
+        'requests': requests,
+        'chapters': chapters,
+    }
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record) + "\n")
@@ -0,0 +1,258 @@
+"""
+Fan-out of synthesis calls across many TTS workers
+
+``fan_out`` submits every item (usually a chunk of text) through an
+executor, keeps a bounded number of calls outstanding and yields results in
+input order as soon as each prefix is complete. Once the queue has drained,
+free slots are used to re-submit stragglers: a call running far longer than
+calls of its size have taken so far gets a duplicate on another worker, and
+whichever copy finishes first is used.
+
+Executors:
+
+- ``LocalExecutor``: a process pool, the offline stand-in; it cannot stop
+  a call once it runs, so the losing copy of a redistributed straggler
+  keeps its process busy until it finishes
+- ``ModalExecutor``: one ``.spawn()`` per item on a Modal method, or
+  ``.map()`` for plain ordered fan-out without redistribution
+"""
+
+import os
+import statistics
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+DEFAULT_STRAGGLER_FACTOR = 3.0
+
+# Calls that must finish before a running one can be judged a straggler
+MIN_COMPLETED_FOR_STRAGGLERS = 4
+
+
+def _worker_call(function, item):
+    return os.getpid(), function(item)
+
+
+class _LocalCall:
+    def __init__(self, future):
+        self.future = future
+
+    def done(self):
+        return self.future.done()
+
+    def result(self):
+        return self.future.result()
+
+    def cancel(self):
+        # A call already running in a process cannot be stopped; its result is ignored
+        self.future.cancel()
+
+
+class LocalExecutor:
+    """
+    Process pool executor; results are attributed to the worker process ID
+
+    ``function`` must be picklable (a module-level function or a
+    ``functools.partial`` of one). Cancelling only drops calls still queued:
+    both copies of a redistributed straggler run to completion, each holding
+    a process, and the slower result is discarded.
+    """
+
+    def __init__(self, function, workers=4):
+        self.function = function
+        self.workers = workers
+        self.pool = ProcessPoolExecutor(max_workers=workers)
+
+    def submit(self, item):
+        return _LocalCall(self.pool.submit(partial(_worker_call, self.function), item))
+
+    def close(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _ModalCall:
+    def __init__(self, call, worker_of):
+        self.call = call
+        self.worker_of = worker_of
+        self.outcome = None
+
+    def done(self):
+        if self.outcome is None:
+            from modal.exception import TimeoutError as ModalTimeoutError
+
+            try:
+                value = self.call.get(timeout=0)
+            except (TimeoutError, ModalTimeoutError):
+                return False
+            except Exception as error:
+                self.outcome = (False, error)
+            else:
+                self.outcome = (True, value)
+        return True
+
+    def result(self):
+        succeeded, value = self.outcome
+        if not succeeded:
+            raise value
+        return self.worker_of(value), value
+
+    def cancel(self):
+        self.call.cancel()
+
+
+class ModalExecutor:
+    """
+    Executor over a Modal method, e.g. ``ChatterboxTTS().generate``
+
+    Args:
+        method: Modal method or function handle
+        workers: Calls to keep outstanding (containers times inputs per container)
+        kwargs: Callable turning an item into the method's keyword arguments
+        worker_of: Callable returning the worker (container) that produced a result
+    """
+
+    def __init__(self, method, workers, kwargs=None, worker_of=None):
+        self.method = method
+        self.workers = workers
+        self.kwargs = kwargs or (lambda item: {'text': item})
+        self.worker_of = worker_of or (lambda value: value.get('worker') if isinstance(value, dict) else None)
+
+    def submit(self, item):
+        return _ModalCall(self.method.spawn(**self.kwargs(item)), self.worker_of)
+
+    def map(self, items, **kwargs):
+        """Ordered results of calling the method on each item, with ``kwargs`` passed to every call"""
+        yield from self.method.map(items, kwargs=kwargs, order_outputs=True)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class FanOutStats:
+    """Per-worker load of a fan-out: calls, busy seconds and item sizes, plus redistributed stragglers"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+        self.workers = {}
+        self.duplicates = 0
+        self.duplicate_wins = 0
+
+    def record(self, worker, seconds, size):
+        with self.lock:
+            row = self.workers.setdefault(worker, {'calls': 0, 'seconds': 0.0, 'size': 0})
+            row['calls'] += 1
+            row['seconds'] += seconds
+            row['size'] += size
+
+    def report(self):
+        """Print each worker's share of the work"""
+        wall = time.monotonic() - self.started
+        print(f"👷 {'Worker':<16} {'Calls':>6} {'Busy':>8} {'Chars':>8} {'Chars/s':>8}")
+        for worker, row in sorted(self.workers.items(), key=lambda item: -item[1]['seconds']):
+            rate = row['size'] / row['seconds'] if row['seconds'] else 0
+            print(f"   {str(worker):<16} {row['calls']:>6} {row['seconds']:>7.1f}s {row['size']:>8} {rate:>8.0f}")
+        busy = sum(row['seconds'] for row in self.workers.values())
+        print(f"   {len(self.workers)} workers, {busy / wall if wall else 0:.1f} busy on average over {wall:.1f}s, "
+              f"{self.duplicates} stragglers re-submitted, {self.duplicate_wins} won by the copy")
+
+
+def fan_out(items, executor, size=len, max_in_flight=None, straggler_factor=DEFAULT_STRAGGLER_FACTOR,
+            poll_interval=0.02, stats=None):
+    """
+    Run every item through ``executor``, yielding ``(index, result)`` in input order
+
+    Args:
+        items: Items to submit, e.g. text chunks
+        executor: ``LocalExecutor``, ``ModalExecutor`` or anything with ``submit(item)``
+            returning a call with ``done()``, ``result()`` → ``(worker, value)`` and ``cancel()``
+        size: Size of an item, used to judge how long its call should take
+        max_in_flight: Calls outstanding at once, duplicates included (default: ``executor.workers``)
+        straggler_factor: A call taking this many times the median time per size unit is
+            re-submitted when a slot is free; None disables redistribution
+        poll_interval: Seconds between checks when no call finished
+        stats: Optional ``FanOutStats`` to fill in
+
+    Raises:
+        The error of a call that failed with no other copy still running
+    """
+    items = list(items)
+    stats = stats if stats is not None else FanOutStats()
+    max_in_flight = max(1, max_in_flight or executor.workers)
+    queued = deque(range(len(items)))
+    running = {}
+    finished = {}
+    per_unit = []
+    next_index = 0
+    try:
+        while next_index < len(items):
+            in_flight = sum(len(calls) for calls in running.values())
+            while queued and in_flight < max_in_flight:
+                index = queued.popleft()
+                running[index] = [(executor.submit(items[index]), time.monotonic(), False)]
+                in_flight += 1
+
+            progressed = False
+            for index, calls in list(running.items()):
+                for position, (call, started, duplicate) in enumerate(calls):
+                    if not call.done():
+                        continue
+                    progressed = True
+                    try:
+                        worker, value = call.result()
+                    except Exception:
+                        calls.pop(position)
+                        if calls:
+                            break
+                        raise
+                    seconds = time.monotonic() - started
+                    stats.record(worker, seconds, size(items[index]))
+                    per_unit.append(seconds / max(1, size(items[index])))
+                    # Also counts a copy that outlived a failed original
+                    if duplicate:
+                        stats.duplicate_wins += 1
+                    for other, _, _ in calls:
+                        if other is not call:
+                            other.cancel()
+                    finished[index] = value
+                    del running[index]
+                    break
+
+            if straggler_factor and not queued and len(per_unit) >= MIN_COMPLETED_FOR_STRAGGLERS:
+                expected = statistics.median(per_unit)
+                now = time.monotonic()
+                in_flight = sum(len(calls) for calls in running.values())
+                # Oldest first: the head of the ordered output is what everything waits for
+                for index in sorted(running):
+                    calls = running[index]
+                    if in_flight >= max_in_flight:
+                        break
+                    limit = straggler_factor * expected * max(1, size(items[index]))
+                    if len(calls) == 1 and now - calls[0][1] > limit:
+                        calls.append((executor.submit(items[index]), now, True))
+                        stats.duplicates += 1
+                        in_flight += 1
+
+            while next_index in finished:
+                yield next_index, finished.pop(next_index)
+                next_index += 1
+            if not progressed:
+                time.sleep(poll_interval)
+    finally:
+        for calls in running.values():
+            for call, _, _ in calls:
+                call.cancel()
@@ -0,0 +1,139 @@
+"""
+Sidecar index of where each chunk lies in a chapter MP3
+
+Every chapter file gets a ``.index.json`` next to it::
+
+    {
+      "version": 2,
+      "audio": "chapter_01_elevenlabs.mp3",
+      "bytes": 5312847,
+      "duration": 331.93,
+      "text_sha256": "…",
+      "settings": "…",
+      "chunks": [
+        {"id": "3f2a9c…", "index": 0, "paragraph": 0, "text_start": 0, "text_end": 4391,
+         "byte_start": 0, "byte_end": 441216, "start": 0.0, "end": 27.58},
+        …
+      ]
+    }
+
+Text offsets are into the normalized chapter text (``load_normalized``) and
+``paragraph`` counts its blank-line separated blocks, so the app can seek
+to a paragraph with one byte offset instead of decoding the file. Chunk
+files contain whole frames only, which also lets an incremental render
+copy unchanged chunks out of the previous chapter file as byte ranges.
+
+``settings`` is the key of the voice, model, voice settings and output
+format the file was rendered with (``providers.synthesis_key``), and chunk
+IDs hash it together with the chunk text, like the audio cache key: audio
+is only ever reused for the same text in the same voice.
+"""
+
+import json
+import os
+from pathlib import Path
+
+from audiobook.chunker import locate_chunks
+from audiobook.manifest import text_hash
+from audiobook.mp3 import ByteRange
+
+INDEX_VERSION = 2
+
+
+def chunk_id(chunk, settings=None):
+    """Stable identifier of a chunk's text rendered with ``settings``"""
+    return text_hash(f"{settings or ''}\n{chunk}")[:16]
+
+
+def index_path(output_path):
+    """Sidecar index path of a chapter file: ``chapter_01.mp3`` → ``chapter_01.index.json``"""
+    return Path(output_path).with_suffix(".index.json")
+
+
+def build_index(output_path, chunks, segments, text=None, settings=None):
+    """
+    Index of a chapter file assembled from ``chunks``
+
+    Args:
+        output_path: Chapter MP3 the index describes
+        chunks: Chunk texts in order
+        segments: ``(byte_start, byte_end, start_seconds, end_seconds)`` per chunk,
+            as recorded by ``OrderedMP3Writer``
+        text: Optional normalized chapter text, for text offsets and paragraphs
+        settings: Synthesis settings key the chunks were rendered with
+
+    Returns:
+        JSON-serializable index
+    """
+    spans = locate_chunks(text, chunks) if text is not None else [None] * len(chunks)
+    entries = []
+    for index, (chunk, span, segment) in enumerate(zip(chunks, spans, segments)):
+        byte_start, byte_end, start, end = segment
+        entry = {'id': chunk_id(chunk, settings), 'index': index}
+        if span is not None:
+            entry.update({'paragraph': text.count("\n\n", 0, span[0]), 'text_start': span[0], 'text_end': span[1]})
+        entry.update({'byte_start': byte_start, 'byte_end': byte_end, 'start': round(start, 3), 'end': round(end, 3)})
+        entries.append(entry)
+    return {
+        'version': INDEX_VERSION,
+        'audio': Path(output_path).name,
+        'bytes': segments[-1][1] if segments else 0,
+        'duration': round(segments[-1][3], 3) if segments else 0.0,
+        'text_sha256': text_hash(text) if text is not None else None,
+        'settings': settings,
+        'chunks': entries,
+    }
+
+
+def write_index(output_path, chunks, segments, text=None, settings=None):
+    """Atomically write the sidecar index of a finished chapter file and return its path"""
+    path = index_path(output_path)
+    temp_path = path.with_name(path.name + ".tmp")
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(build_index(output_path, chunks, segments, text, settings), f, indent=1)
+    os.replace(temp_path, path)
+    return path
+
+
+def load_index(output_path):
+    """
+    Sidecar index of a chapter file, or None
+
+    An index is only returned if it matches the file next to it: same name
+    and size. A file rewritten by another tool has no usable index.
+    """
+    path = index_path(output_path)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        size = Path(output_path).stat().st_size
+    except (OSError, ValueError):
+        return None
+    if index.get('version') != INDEX_VERSION or index.get('audio') != Path(output_path).name:
+        return None
+    if index.get('bytes') != size:
+        return None
+    return index
+
+
+def reusable_ranges(output_path, chunks, settings=None):
+    """
+    Map chunk index to the ``ByteRange`` of the same text in the existing chapter file
+
+    Used by incremental renders to splice unchanged chunks straight out of
+    the previous render instead of re-reading and re-parsing their chunk
+    files. A file rendered with other ``settings`` has nothing to reuse.
+    """
+    index = load_index(output_path)
+    if index is None or index.get('settings') != settings:
+        return {}
+    previous = {}
+    for entry in index['chunks']:
+        previous.setdefault(entry['id'], entry)
+    ranges = {}
+    for i, chunk in enumerate(chunks):
+        entry = previous.get(chunk_id(chunk, settings))
+        if entry is not None:
+            ranges[i] = ByteRange(str(output_path), entry['byte_start'], entry['byte_end'],
+                                  entry['end'] - entry['start'])
+    return ranges
@@ -0,0 +1,208 @@
+"""
+Persistent job manifest that lets chapter generation resume after a failure
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from audiobook.metrics import DEFAULT_METRICS
+
+DEFAULT_WORK_DIR = os.environ.get("AUDIOBOOK_WORK_DIR", "/tmp/audiobook-work")
+
+
+def text_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class JobManifest:
+    """
+    Per-language JSON record of every chunk's status and audio file
+
+    Layout on disk::
+
+        <work_dir>/<language>/manifest.json
+        <work_dir>/<language>/chapter_01/chunks.json   (chunk texts of the latest plan)
+        <work_dir>/<language>/chapter_01/chunk_000_<hash>.mp3
+
+    Chunk audio is matched to chunks by the hash of their text, not by
+    position, so an edit that adds or removes chunks keeps the audio of
+    every unchanged one. Every chunk and finished chapter also records the
+    ``settings`` key it was rendered with (a hash of the voice, model, voice
+    settings and output format, see ``providers.synthesis_key``); audio
+    rendered with other settings is never reused.
+    """
+
+    def __init__(self, language, work_dir=DEFAULT_WORK_DIR, resume=True, settings=None):
+        self.language = language
+        self.settings = settings
+        self.directory = Path(work_dir) / language
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.path = self.directory / "manifest.json"
+        self.lock = threading.RLock()
+        self.data = {'language': language, 'chapters': {}}
+        if resume and self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.data = json.load(f)
+
+    def save(self):
+        """Atomically write the manifest to disk"""
+        with self.lock:
+            temp_path = self.path.with_suffix(".json.tmp")
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.data, f, indent=2, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+
+    def _chapter(self, chapter_number):
+        return self.data['chapters'].setdefault(str(chapter_number), {'status': 'pending', 'chunks': []})
+
+    def chapter_dir(self, chapter_number):
+        chapter_dir = self.directory / f"chapter_{str(chapter_number).zfill(2)}"
+        chapter_dir.mkdir(exist_ok=True)
+        return chapter_dir
+
+    def chunk_path(self, chapter_number, index):
+        with self.lock:
+            digest = self._chapter(chapter_number)['chunks'][index]['sha256']
+        return self.chapter_dir(chapter_number) / f"chunk_{str(index).zfill(3)}_{digest[:12]}.mp3"
+
+    def chunk_texts(self, chapter_number):
+        """Chunk texts recorded by the latest ``plan_chapter`` call, or None"""
+        path = self.chapter_dir(chapter_number) / "chunks.json"
+        if not path.exists():
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _reusable(self, chapter_number, chunks):
+        """Map chunk index to the finished entry holding audio for the same text"""
+        done = {}
+        for entry in self._chapter(chapter_number)['chunks']:
+            if entry['status'] == 'done' and entry.get('settings') == self.settings and entry['path'] \
+                    and Path(entry['path']).exists():
+                done.setdefault(entry['sha256'], entry)
+        reusable = {}
+        for i, chunk in enumerate(chunks):
+            entry = done.get(text_hash(chunk))
+            if entry is not None:
+                reusable[i] = entry
+        return reusable
+
+    def pending_chunks(self, chapter_number, chunks):
+        """Indices of ``chunks`` that have no audio yet, without changing the manifest"""
+        with self.lock:
+            reusable = self._reusable(chapter_number, chunks)
+            return [i for i in range(len(chunks)) if i not in reusable]
+
+    def plan_chapter(self, chapter_number, chunks):
+        """
+        Record the chunks of a chapter and return the indices still to synthesize
+
+        Chunks whose text matches a finished chunk whose audio file still
+        exists, at any position, keep that audio; everything else is
+        'pending'. The chunk texts are saved for ``chunk_texts``.
+        """
+        with self.lock:
+            chapter = self._chapter(chapter_number)
+            reusable = self._reusable(chapter_number, chunks)
+            entries = []
+            pending = []
+            for i, chunk in enumerate(chunks):
+                if i in reusable:
+                    entries.append(dict(reusable[i]))
+                    continue
+                entries.append({'sha256': text_hash(chunk), 'chars': len(chunk), 'settings': self.settings,
+                                'status': 'pending', 'path': None})
+                pending.append(i)
+            chapter['chunks'] = entries
+            if pending or [entry['sha256'] for entry in entries] != chapter.get('rendered') \
+                    or chapter.get('settings') != self.settings:
+                chapter['status'] = 'pending'
+            self.save()
+
+            texts_path = self.chapter_dir(chapter_number) / "chunks.json"
+            temp_path = texts_path.with_suffix(".json.tmp")
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(chunks, f, ensure_ascii=False)
+            os.replace(temp_path, texts_path)
+            return pending
+
+    def mark_done(self, chapter_number, index, path):
+        with self.lock:
+            entry = self._chapter(chapter_number)['chunks'][index]
+            entry.update({'status': 'done', 'path': str(path), 'error': None, 'finished_at': time.time()})
+            self.save()
+
+    def mark_failed(self, chapter_number, index, error):
+        with self.lock:
+            entry = self._chapter(chapter_number)['chunks'][index]
+            entry.update({'status': 'failed', 'error': str(error)})
+            self.save()
+
+    def chunk_paths(self, chapter_number):
+        """Audio file of each chunk in order (None for chunks without audio yet)"""
+        with self.lock:
+            return [Path(entry['path']) if entry['path'] else None
+                    for entry in self._chapter(chapter_number)['chunks']]
+
+    def mark_chapter_complete(self, chapter_number, output_path):
+        """Record the chapter file and delete chunk audio it no longer uses"""
+        with self.lock:
+            chapter = self._chapter(chapter_number)
+            chapter.update({
+                'status': 'complete',
+                'output_path': str(output_path),
+                'rendered': [entry['sha256'] for entry in chapter['chunks']],
+                'settings': self.settings,
+            })
+            self.save()
+            used = {entry['path'] for entry in chapter['chunks']}
+            for path in self.chapter_dir(chapter_number).glob("chunk_*.mp3"):
+                if str(path) not in used:
+                    path.unlink(missing_ok=True)
+
+    def is_chapter_complete(self, chapter_number):
+        """True if the chapter file exists and was rendered with this manifest's settings"""
+        with self.lock:
+            chapter = self.data['chapters'].get(str(chapter_number))
+            return bool(chapter and chapter['status'] == 'complete' and chapter.get('output_path')
+                        and chapter.get('settings') == self.settings and Path(chapter['output_path']).exists())
+
+    def is_chapter_current(self, chapter_number, chunks):
+        """True if the chapter file is complete and was rendered from exactly ``chunks``"""
+        with self.lock:
+            if not self.is_chapter_complete(chapter_number):
+                return False
+            rendered = self.data['chapters'][str(chapter_number)].get('rendered')
+            return rendered == [text_hash(chunk) for chunk in chunks]
+
+    def synthesize_chunk(self, chapter_number, index, text, synthesize, stream=False):
+        """
+        Synthesize one chunk into its audio file and record the outcome
+
+        The audio is written to a ``.part`` file and moved into place once
+        complete, so an interrupted run never leaves a truncated chunk behind.
+
+        Returns:
+            Path of the chunk's audio file
+        """
+        path = self.chunk_path(chapter_number, index)
+        part_path = path.with_name(path.name + ".part")
+        try:
+            if stream:
+                with open(part_path, 'wb') as f:
+                    synthesize(text, f)
+            else:
+                audio = synthesize(text)
+                with DEFAULT_METRICS.timer('disk_write', bytes=len(audio)):
+                    part_path.write_bytes(audio)
+        except Exception as error:
+            part_path.unlink(missing_ok=True)
+            self.mark_failed(chapter_number, index, error)
+            raise
+        os.replace(part_path, path)
+        self.mark_done(chapter_number, index, path)
+        return path
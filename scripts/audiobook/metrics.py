@@ -0,0 +1,149 @@
+"""
+Per-operation timing metrics for the audiobook pipeline
+
+Every timed operation becomes one JSON line (when an output file is open)
+and is kept in memory for the summary table printed by ``report()``:
+
+- http / http_stream: one ElevenLabs request including retries and backoff
+  but not rate-limiter waits (chars, bytes, retries, time to first byte
+  when streaming)
+- modal / encode: a Chatterbox call and its MP3 transcode
+- rate_wait: time a worker waited on the rate limiter before a request
+- chunk: a whole chunk as seen by the scheduler, synthesis plus saving
+- concat: appending one chunk's frames to a chapter file (bytes, audio_seconds)
+- disk_read / disk_write, cache_read / cache_write: file I/O
+
+    {"t": 12.31, "op": "http", "seconds": 8.02, "chars": 4412, "bytes": 311472, "retries": 0}
+
+The summary's latency percentiles, per-operation throughput and the run's
+audio seconds per wall-clock second are what to compare when tuning
+``--concurrency``.
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a sorted list"""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+class Metrics:
+    """Thread-safe collector of timed operations, optionally mirrored to a JSON-lines file"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.file = None
+        self.path = None
+        self.started = time.monotonic()
+        self.events = {}
+
+    def open(self, path):
+        """Start a new run: clear collected events and write new ones to ``path``"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+            self.file = open(path, 'a', encoding='utf-8', buffering=1)
+            self.path = path
+            self.started = time.monotonic()
+            self.events = {}
+        return path
+
+    def close(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+    def record(self, op, seconds, **fields):
+        """Record one finished operation"""
+        event = {'t': round(time.monotonic() - self.started, 3), 'op': op, 'seconds': round(seconds, 4)}
+        event.update(fields)
+        with self.lock:
+            self.events.setdefault(op, []).append(event)
+            if self.file is not None:
+                self.file.write(json.dumps(event) + "\n")
+
+    @contextmanager
+    def timer(self, op, **fields):
+        """
+        Time the enclosed block as ``op``
+
+        Yields the event's fields so the block can add measurements such as
+        ``bytes``, or ``excluded_seconds`` to leave time spent waiting on
+        something else out of the duration; an exception is recorded as
+        ``error`` and re-raised.
+        """
+        start = time.monotonic()
+        try:
+            yield fields
+        except BaseException as error:
+            fields['error'] = type(error).__name__
+            raise
+        finally:
+            self.record(op, time.monotonic() - start - fields.pop('excluded_seconds', 0.0), **fields)
+
+    def summary(self):
+        """Per-operation statistics: count, errors, total, p50/p90/p99/max seconds and throughput"""
+        with self.lock:
+            events = {op: list(items) for op, items in self.events.items()}
+        rows = []
+        for op, items in events.items():
+            seconds = sorted(event['seconds'] for event in items)
+            total = sum(seconds)
+            chars = sum(event.get('chars', 0) for event in items)
+            size = sum(event.get('bytes', 0) for event in items)
+            rows.append({
+                'op': op,
+                'count': len(items),
+                'errors': sum(1 for event in items if 'error' in event),
+                'retries': sum(event.get('retries', 0) for event in items),
+                'total_seconds': total,
+                'p50': percentile(seconds, 0.5),
+                'p90': percentile(seconds, 0.9),
+                'p99': percentile(seconds, 0.99),
+                'max': seconds[-1],
+                'chars': chars,
+                'bytes': size,
+                'audio_seconds': sum(event.get('audio_seconds', 0) for event in items),
+                'chars_per_second': chars / total if chars and total else None,
+                'bytes_per_second': size / total if size and total else None,
+            })
+        return sorted(rows, key=lambda row: -row['total_seconds'])
+
+    def report(self):
+        """Print the summary table for this run"""
+        rows = self.summary()
+        if not rows:
+            return
+        wall = time.monotonic() - self.started
+        print(f"📊 {'Operation':<12} {'Count':>6} {'Err':>4} {'Total':>8} {'p50':>7} {'p90':>7} {'p99':>7} "
+              f"{'Max':>7}  Throughput")
+        for row in rows:
+            if row['chars_per_second']:
+                throughput = f"{row['chars_per_second']:.0f} chars/s"
+            elif row['bytes_per_second']:
+                throughput = f"{row['bytes_per_second'] / 1024 / 1024:.1f} MB/s"
+            else:
+                throughput = ""
+            print(f"   {row['op']:<12} {row['count']:>6} {row['errors']:>4} {row['total_seconds']:>7.1f}s "
+                  f"{row['p50']:>6.2f}s {row['p90']:>6.2f}s {row['p99']:>6.2f}s {row['max']:>6.2f}s  {throughput}")
+        requests = [row for row in rows if row['op'] in ('http', 'http_stream', 'modal')]
+        chars = sum(row['chars'] for row in requests)
+        retries = sum(row['retries'] for row in requests)
+        audio = sum(row['audio_seconds'] for row in rows if row['op'] == 'concat')
+        print(f"   Run: {wall:.0f}s wall, {chars / wall if wall else 0:.0f} chars/s, "
+              f"{audio / wall if wall else 0:.1f} audio seconds per second, {retries} retries")
+        if self.path is not None:
+            print(f"   Metrics: {self.path}")
+
+
+DEFAULT_METRICS = Metrics()
@@ -0,0 +1,245 @@
+"""
+Streaming MP3 concatenation that appends frames straight to the output file
+"""
+
+import os
+import subprocess
+import threading
+from collections import namedtuple
+from pathlib import Path
+
+from audiobook.metrics import DEFAULT_METRICS
+
+# Bitrates in kbps indexed by [mpeg1][layer3][index]
+_BITRATES = {
+    True: [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    False: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+_SAMPLE_RATES = {
+    3: [44100, 48000, 32000],  # MPEG 1
+    2: [22050, 24000, 16000],  # MPEG 2
+    0: [11025, 12000, 8000],   # MPEG 2.5
+}
+
+
+def id3v2_size(data):
+    """Length of a leading ID3v2 tag (0 if there is none)"""
+    if len(data) < 10 or data[:3] != b'ID3':
+        return 0
+    size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def parse_frame_header(data, offset):
+    """
+    Parse a Layer III frame header at ``offset``
+
+    Returns:
+        (frame_length, samples_per_frame, sample_rate, side_info_length) or None
+    """
+    if offset + 4 > len(data):
+        return None
+    b1, b2, b3 = data[offset + 1], data[offset + 2], data[offset + 3]
+    if data[offset] != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+    version = (b1 >> 3) & 0x03
+    layer = (b1 >> 1) & 0x03
+    bitrate_index = (b2 >> 4) & 0x0F
+    sample_rate_index = (b2 >> 2) & 0x03
+    if version == 1 or layer != 1 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+    mpeg1 = version == 3
+    bitrate = _BITRATES[mpeg1][bitrate_index] * 1000
+    sample_rate = _SAMPLE_RATES[version][sample_rate_index]
+    padding = (b2 >> 1) & 0x01
+    mono = (b3 >> 6) & 0x03 == 3
+    if mpeg1:
+        length = 144 * bitrate // sample_rate + padding
+        samples = 1152
+        side_info = 17 if mono else 32
+    else:
+        length = 72 * bitrate // sample_rate + padding
+        samples = 576
+        side_info = 9 if mono else 17
+    return length, samples, sample_rate, side_info
+
+
+def is_vbr_header_frame(data, offset, header):
+    """True if the frame at ``offset`` is a Xing/Info/VBRI header rather than audio"""
+    side_info = header[3]
+    tag_offset = offset + 4 + side_info
+    if data[tag_offset:tag_offset + 4] in (b'Xing', b'Info'):
+        return True
+    return data[offset + 36:offset + 40] == b'VBRI'
+
+
+def iter_audio_frames(data):
+    """
+    Yield ``(start, end, samples, sample_rate)`` for each audio frame in ``data``
+
+    Skips ID3v2/ID3v1 tags, the Xing/Info/VBRI header frame and any bytes that
+    are not part of a valid frame.
+    """
+    end_of_audio = len(data)
+    if end_of_audio >= 128 and data[end_of_audio - 128:end_of_audio - 125] == b'TAG':
+        end_of_audio -= 128
+    offset = id3v2_size(data)
+    first = True
+    while offset < end_of_audio:
+        header = parse_frame_header(data, offset)
+        if header is None or offset + header[0] > end_of_audio:
+            offset += 1
+            continue
+        length, samples, sample_rate, _ = header
+        if not (first and is_vbr_header_frame(data, offset, header)):
+            yield offset, offset + length, samples, sample_rate
+        first = False
+        offset += length
+
+
+# Frames already in a file written by ``MP3Writer``: bytes [start, end) of ``path``
+ByteRange = namedtuple('ByteRange', ['path', 'start', 'end', 'duration'])
+
+
+class MP3Writer:
+    """
+    Append MP3 chunks to one output file frame by frame
+
+    Each chunk's tags and per-file VBR header are dropped so the output is a
+    single clean stream; only one chunk is held in memory at a time.
+    """
+
+    def __init__(self, output_path):
+        self.output_path = Path(output_path)
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        self.file = open(self.output_path, 'wb')
+        self.bytes_written = 0
+        self.duration = 0.0
+
+    def append(self, data):
+        """Append one chunk's MP3 bytes, returning the number of bytes written"""
+        view = memoryview(data)
+        written = 0
+        duration = 0.0
+        with DEFAULT_METRICS.timer('concat') as event:
+            for start, end, samples, sample_rate in iter_audio_frames(data):
+                self.file.write(view[start:end])
+                written += end - start
+                duration += samples / sample_rate
+            event.update(bytes=written, audio_seconds=round(duration, 3))
+        self.bytes_written += written
+        self.duration += duration
+        return written
+
+    def append_range(self, source):
+        """Copy a ``ByteRange`` of clean frames verbatim, without parsing it"""
+        with DEFAULT_METRICS.timer('concat', bytes=source.end - source.start,
+                                   audio_seconds=round(source.duration, 3)):
+            with open(source.path, 'rb') as f:
+                f.seek(source.start)
+                remaining = source.end - source.start
+                while remaining > 0:
+                    block = f.read(min(remaining, 1024 * 1024))
+                    if not block:
+                        raise Exception(f"{source.path} ends before byte {source.end}")
+                    self.file.write(block)
+                    remaining -= len(block)
+        self.bytes_written += source.end - source.start
+        self.duration += source.duration
+        return source.end - source.start
+
+    def append_file(self, path):
+        with DEFAULT_METRICS.timer('disk_read') as event:
+            with open(path, 'rb') as f:
+                data = f.read()
+            event['bytes'] = len(data)
+        return self.append(data)
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class OrderedMP3Writer:
+    """
+    Stream chunks into the output in order while they finish out of order
+
+    Chunks are added by index as they complete; each is appended as soon as
+    every earlier chunk has been written. The output is built in a ``.part``
+    file and moved into place by ``finish()``. ``segments`` records where
+    each chunk landed as ``(byte_start, byte_end, start_seconds, end_seconds)``.
+    """
+
+    def __init__(self, output_path, total_chunks):
+        self.output_path = Path(output_path)
+        self.part_path = self.output_path.with_name(self.output_path.name + ".part")
+        self.writer = MP3Writer(self.part_path)
+        self.total_chunks = total_chunks
+        self.ready = {}
+        self.next_index = 0
+        self.segments = []
+        self.lock = threading.Lock()
+
+    @property
+    def bytes_written(self):
+        return self.writer.bytes_written
+
+    @property
+    def duration(self):
+        return self.writer.duration
+
+    @property
+    def complete(self):
+        """True once every chunk has been appended"""
+        return self.next_index == self.total_chunks
+
+    def add(self, index, source):
+        """Register chunk ``index`` (an MP3 file or a ``ByteRange``) and flush any contiguous run"""
+        with self.lock:
+            self.ready[index] = source
+            while self.next_index in self.ready:
+                source = self.ready.pop(self.next_index)
+                byte_start, start = self.writer.bytes_written, self.writer.duration
+                if isinstance(source, ByteRange):
+                    self.writer.append_range(source)
+                else:
+                    self.writer.append_file(source)
+                self.segments.append((byte_start, self.writer.bytes_written, start, self.writer.duration))
+                self.next_index += 1
+
+    def finish(self):
+        """Close the stream and move it to ``output_path``; all chunks must have been added"""
+        with self.lock:
+            self.writer.close()
+            if self.next_index != self.total_chunks:
+                raise Exception(f"Missing chunks: wrote {self.next_index} of {self.total_chunks}")
+            os.replace(self.part_path, self.output_path)
+            return self.output_path
+
+    def abort(self):
+        with self.lock:
+            self.writer.close()
+            self.part_path.unlink(missing_ok=True)
+
+
+def encode_mp3(audio, bitrate="128k"):
+    """Transcode encoded audio (WAV, FLAC, ...) to MP3 bytes with ffmpeg"""
+    with DEFAULT_METRICS.timer('encode', bytes=len(audio)):
+        result = subprocess.run(
+            ['ffmpeg', '-hide_banner', '-loglevel', 'error', '-i', 'pipe:0',
+             '-codec:a', 'libmp3lame', '-b:a', bitrate, '-f', 'mp3', 'pipe:1'],
+            input=audio,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            check=False
+        )
+    if result.returncode != 0:
+        raise Exception(f"ffmpeg could not encode MP3: {result.stderr.decode(errors='replace').strip()}")
+    return result.stdout
+
@@ -0,0 +1,278 @@
+"""
+Normalization of PDF-extracted manuscript text before synthesis
+
+The chapter files are hard-wrapped at ~90 columns, with page breaks (form
+feeds and stray blank lines) in the middle of sentences and headings that
+wrap onto a second line. Feeding that to the TTS API wastes billed
+characters and produces pauses at every line break. This pass rebuilds the
+text as one line per block, blocks separated by a blank line:
+
+- wrapped lines are joined back into paragraphs
+- words split across lines are rejoined
+- headings and list items become blocks of their own
+- markdown emphasis and bullet markers left over from the drafts are dropped
+
+The result is cached per chapter under the work directory, keyed by a hash
+of the source text, so it is computed once rather than on every run. To see
+the normalized text of a chapter:
+
+    python scripts/audiobook/normalize.py manuscript-chapters/chapter_01.txt
+"""
+
+import os
+import re
+import sys
+import tempfile
+from pathlib import Path
+
+if __name__ == "__main__":
+    # Run as a script: make the audiobook package importable, as the scripts in scripts/ do
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from audiobook.manifest import DEFAULT_WORK_DIR, text_hash
+
+# Bump when the output changes so cached files are rebuilt
+NORMALIZER_VERSION = 2
+
+DEFAULT_CACHE_DIR = Path(DEFAULT_WORK_DIR) / "normalized"
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+MANUSCRIPT_DIRS = {
+    'en': REPO_ROOT / "manuscript-chapters",
+    'pt': REPO_ROOT / "manuscript-chapters-pt",
+}
+
+# A paragraph's last line is shorter than the wrap width by at least this share
+SHORT_LINE_RATIO = 0.8
+# Headings are shorter than a full line of wrapped prose
+HEADING_WIDTH_RATIO = 0.9
+
+_TERMINAL = '.!?…:;,"\'”’»'
+_CLOSING = ')]"\'”’»'
+_LIST_ITEM = re.compile(r'(?:\d+[.)]|[A-Za-z]\)|[•●▪*–-])\s')
+_HYPHENATED_END = re.compile(r'(\w+)-$')
+_LEADING_WORD = re.compile(r'^(\w+)')
+_WORD = re.compile(r'\w+(?:-\w+)*')
+_PARENTHETICAL = re.compile(r'^\([^()]*\)$')
+_BULLET = re.compile(r'^[*•●▪–-]\s+')
+_EMPHASIS = re.compile(r'\*\*')
+_SPACES = re.compile(r'\s{2,}')
+_TITLE_WORD = re.compile(r"[^\W\d_][\w’'-]{3,}")
+_CHAPTER_TITLE = re.compile(r'^(?:Chapter|Capítulo) \d+:')
+
+
+def _line_width(lines):
+    """Wrap width of the text: the 90th percentile of non-blank line lengths"""
+    lengths = sorted(len(line.strip()) for line in lines if line.strip())
+    if not lengths:
+        return 0
+    return lengths[int(len(lengths) * 0.9)]
+
+
+def _ends_sentence(line):
+    stripped = line.rstrip(_CLOSING)
+    return bool(stripped) and stripped[-1] in '.!?…'
+
+
+def _ends_block(line, lines, index, width):
+    """
+    True if ``line`` closes its block, given the lines from ``index`` on
+
+    A block ends at a sentence end on a short line, or on any line when the
+    next one starts a list item or a heading. A trailing
+    colon ends it too when the next line starts with a capital (a list of
+    questions or examples follows).
+    """
+    if index >= len(lines):
+        return True
+    next_line = lines[index][0]
+    if line[-1] == ':':
+        return not next_line[:1].islower()
+    if not _ends_sentence(line):
+        return False
+    if len(line) < width * SHORT_LINE_RATIO or _LIST_ITEM.match(next_line):
+        return True
+    following = lines[index + 1][0] if index + 1 < len(lines) else None
+    return _is_heading(next_line, following, width)
+
+
+def _is_title_case(line):
+    """True if most words longer than three letters are capitalized"""
+    words = _TITLE_WORD.findall(line)
+    return sum(word[0].isupper() for word in words) >= 0.6 * len(words)
+
+
+def _is_heading(line, next_line, width):
+    """Short, unpunctuated, title-case line not followed by a lower-case continuation"""
+    if line.rstrip(')')[-1:] in _TERMINAL or line.count('“') > line.count('”') or line.count('"') % 2:
+        return False
+    if not _is_title_case(line):
+        return False
+    if next_line is not None and next_line[:1].islower() \
+            and not (_CHAPTER_TITLE.match(line) and _continues_heading(line, len(line), next_line, width)):
+        # A chapter title may still wrap onto "in a World of Unfairness"
+        return False
+    last_word = line.split()[-1]
+    if last_word.isalpha() and last_word.islower():
+        # "... Power and" only makes sense as a heading that wraps onto a short line
+        return next_line is not None and len(next_line) < width * SHORT_LINE_RATIO
+    if next_line is not None and _PARENTHETICAL.match(next_line):
+        return len(line) <= width  # a long title wrapped before "(Expanded)"
+    return len(line) < width * HEADING_WIDTH_RATIO
+
+
+def _continues_heading(heading, line_length, next_line, width):
+    """
+    True if a heading wraps onto ``next_line``
+
+    That is the case for a trailing "(Expanded)", after a lower-case word
+    ("... Power and"), after a line that fills the width and for the
+    chapter title, which is never followed directly by another heading: a
+    title-case line, or one that only ends in a capitalized word ("into
+    Strength"), continues it.
+    """
+    if next_line is None:
+        return False
+    if _PARENTHETICAL.match(next_line):
+        return True
+    if len(next_line) >= width * SHORT_LINE_RATIO:
+        return False
+    last_word = heading.split()[-1]
+    if last_word.isalpha() and last_word.islower():
+        return next_line[-1:] not in _TERMINAL or next_line[-1:] in '?!'
+    return (
+        next_line[-1:] not in _TERMINAL
+        and line_length >= width * SHORT_LINE_RATIO
+        or (_CHAPTER_TITLE.match(heading) and (_is_title_case(next_line) or _ends_capitalized(next_line)))
+    )
+
+
+def _ends_capitalized(line):
+    """True if an unpunctuated line ends in a capitalized word, like a wrapped title"""
+    return line[-1:] not in _TERMINAL and line.split()[-1][:1].isupper()
+
+
+def _clean(block):
+    """Drop bullet markers and repeated spaces from a block"""
+    return _SPACES.sub(' ', _BULLET.sub('', block))
+
+
+def _join(previous, line, vocabulary):
+    """Append ``line`` to a block, rejoining a word split across the line break"""
+    split = _HYPHENATED_END.search(previous)
+    following = _LEADING_WORD.match(line)
+    if not split or not following:
+        return f"{previous} {line}"
+    head, tail = split.group(1), following.group(1)
+    if f"{head}-{tail}".lower() not in vocabulary and f"{head}{tail}".lower() in vocabulary:
+        return previous[:-1] + line
+    # Line breaks in these manuscripts fall at real hyphens ("livre-arbítrio"), so keep it by default
+    return previous + line
+
+
+def normalize_blocks(text):
+    """
+    Split raw chapter text into ``(kind, text)`` blocks
+
+    ``kind`` is 'heading', 'item' (list entries and indented runs of lines)
+    or 'paragraph'; each block's text is a single line.
+    """
+    text = _EMPHASIS.sub('', text.replace('\r\n', '\n').replace('\r', '\n').replace('\f', '\n'))
+    raw_lines = [line.rstrip() for line in text.split('\n')]
+    # Blank lines are page breaks as often as paragraph breaks, so blocks are ended by punctuation
+    lines = [(line.strip(), len(line) - len(line.lstrip())) for line in raw_lines if line.strip()]
+    width = _line_width(raw_lines)
+    vocabulary = {word.lower() for word in _WORD.findall(text)}
+
+    blocks = []
+    current = None
+    kind = None
+    indent = 0
+    index = 0
+    while index < len(lines):
+        line, line_indent = lines[index]
+        next_line = lines[index + 1][0] if index + 1 < len(lines) else None
+        index += 1
+        # Markdown list items continue on indented lines, so only a change of indentation starts a block
+        indent_changed = line_indent != indent and not (current and _LIST_ITEM.match(current))
+        indent = line_indent
+
+        if current is not None and (indent_changed or _LIST_ITEM.match(line)):
+            blocks.append((kind, _clean(current)))
+            current = None
+
+        if current is None and _is_heading(line, next_line, width):
+            heading = line
+            while _continues_heading(heading, len(lines[index - 1][0]), next_line, width):
+                heading = f"{heading} {next_line}"
+                indent = lines[index][1]
+                index += 1
+                next_line = lines[index][0] if index < len(lines) else None
+            blocks.append(('heading', _clean(heading)))
+            continue
+
+        if current is None:
+            current = line
+            kind = 'item' if line_indent or _LIST_ITEM.match(line) else 'paragraph'
+        else:
+            current = _join(current, line, vocabulary)
+
+        if _ends_block(line, lines, index, width):
+            blocks.append((kind, _clean(current)))
+            current = None
+
+    if current is not None:
+        blocks.append((kind, _clean(current)))
+    return blocks
+
+
+def normalize_text(text):
+    """Normalized chapter text: one block per line, blocks separated by a blank line"""
+    return "\n\n".join(block for _, block in normalize_blocks(text)) + "\n"
+
+
+def chapter_path(lang, chapter_number):
+    """Path of a chapter's manuscript text in the repository"""
+    return MANUSCRIPT_DIRS[lang] / f"chapter_{str(chapter_number).zfill(2)}.txt"
+
+
+def available_chapters(lang):
+    """Sorted chapter numbers that have a manuscript file for ``lang``"""
+    return sorted(int(path.stem.split('_')[1]) for path in MANUSCRIPT_DIRS[lang].glob("chapter_*.txt"))
+
+
+def load_normalized(path, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Read a manuscript chapter and return its normalized text
+
+    The result is cached as ``<cache_dir>/<source dir>/<stem>-<hash>.txt``;
+    entries for older versions of the same chapter are removed.
+    """
+    path = Path(path)
+    source = path.read_text(encoding='utf-8')
+    key = text_hash(f"{NORMALIZER_VERSION}\n{source}")[:16]
+    directory = Path(cache_dir) / path.parent.name
+    cached = directory / f"{path.stem}-{key}.txt"
+    if cached.exists():
+        return cached.read_text(encoding='utf-8')
+
+    normalized = normalize_text(source)
+    directory.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(normalized)
+    os.replace(tmp_path, cached)
+    for stale in directory.glob(f"{path.stem}-*.txt"):
+        if stale != cached:
+            stale.unlink(missing_ok=True)
+    return normalized
+
+
+def main():
+    """Print the normalized text of each chapter file given on the command line"""
+    for path in sys.argv[1:]:
+        sys.stdout.write(normalize_text(Path(path).read_text(encoding='utf-8')))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Text-to-speech providers selectable from the audiobook CLI
+
+Each provider's client is imported only when it is used, so a dry run or an
+ElevenLabs run never loads Modal, and neither needs ``requests`` until the
+first request is made.
+"""
+
+import sys
+
+from audiobook.cache import cache_key, settings_key
+from audiobook.metrics import DEFAULT_METRICS
+from audiobook.normalize import REPO_ROOT
+from audiobook.synthesis import before_request
+
+PROVIDERS = ('elevenlabs', 'chatterbox')
+
+# Characters per request: the ElevenLabs request limit, and the text length
+# Chatterbox Turbo handles without drifting
+MAX_CHARS = {
+    'elevenlabs': 4500,
+    'chatterbox': 600,
+}
+
+DEFAULT_VOICES = {
+    'elevenlabs': "9SMbtbEswwG78xP75Lqm",  # Cloned author voice
+    'chatterbox': "marco",
+}
+
+CHATTERBOX_MODEL_ID = "chatterbox-turbo"
+CHATTERBOX_BITRATE = "128k"
+
+
+def synthesis_settings(provider, voice):
+    """
+    Everything besides the text that determines a provider's audio
+
+    Returns:
+        Keyword arguments for ``cache_key`` and ``settings_key``: voice_id,
+        model_id, voice_settings and output_format
+    """
+    if provider == 'elevenlabs':
+        from audiobook.elevenlabs import MODEL_ID, OUTPUT_FORMAT, VOICE_SETTINGS
+        return {'voice_id': voice, 'model_id': MODEL_ID, 'voice_settings': VOICE_SETTINGS,
+                'output_format': OUTPUT_FORMAT}
+    if provider == 'chatterbox':
+        return {'voice_id': voice, 'model_id': CHATTERBOX_MODEL_ID, 'voice_settings': None,
+                'output_format': f"mp3_{CHATTERBOX_BITRATE}"}
+    raise ValueError(f"Unknown provider: {provider}")
+
+
+def synthesis_key(provider, voice):
+    """Hash of ``synthesis_settings``, recorded with rendered audio to detect a voice or model change"""
+    return settings_key(**synthesis_settings(provider, voice))
+
+
+def elevenlabs_synthesizer(voice_id, cache=None, stream=False):
+    """Synthesize function for ``ChapterJob`` backed by the ElevenLabs API"""
+    from audiobook.elevenlabs import generate_speech, stream_speech
+
+    if stream:
+        # Streaming endpoint: audio goes straight to disk as it is generated
+        return lambda chunk, out: stream_speech(voice_id, chunk, out, cache=cache)
+    return lambda chunk: generate_speech(voice_id, chunk, cache=cache)
+
+
+def chatterbox_synthesizer(voice_name, cache=None, client=None):
+    """
+    Synthesize function for ``ChapterJob`` backed by the deployed Chatterbox service
+
+    Audio comes back as FLAC and is encoded to MP3 locally so chapters can be
+    assembled by the same frame writer as ElevenLabs output. ``client``
+    replaces the Modal client, e.g. with ``stub_server.StubChatterboxClient``.
+    """
+    from audiobook.mp3 import encode_mp3
+
+    if client is None:
+        sys.path.insert(0, str(REPO_ROOT))
+        from modal_chatterbox import ChatterboxClient
+        client = ChatterboxClient()
+
+    settings = synthesis_settings('chatterbox', voice_name)
+
+    def synthesize(chunk):
+        key = None
+        if cache is not None:
+            key = cache_key(chunk, **settings)
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+        before_request()
+        with DEFAULT_METRICS.timer('modal', chars=len(chunk)) as event:
+            flac = client.synthesize(chunk, voice_name=voice_name)
+            event['bytes'] = len(flac)
+        audio = encode_mp3(flac, bitrate=CHATTERBOX_BITRATE)
+        if cache is not None:
+            cache.put(key, audio)
+        return audio
+
+    return synthesize
+
+
+def get_synthesizer(provider, voice, cache=None, stream=False, client=None):
+    """
+    Build the synthesize callable for a provider
+
+    Args:
+        provider: 'elevenlabs' or 'chatterbox'
+        voice: ElevenLabs voice ID or Chatterbox voice name
+        cache: Optional AudioCache consulted before each request
+        stream: ElevenLabs only; return a ``(text, file)`` streaming function
+        client: Chatterbox only; client to use instead of the deployed service
+
+    Returns:
+        Function with the ``synthesize`` contract of ``ChapterJob``
+    """
+    if provider == 'elevenlabs':
+        return elevenlabs_synthesizer(voice, cache=cache, stream=stream)
+    if provider == 'chatterbox':
+        if stream:
+            raise ValueError("--stream is only supported by the elevenlabs provider")
+        return chatterbox_synthesizer(voice, cache=cache, client=client)
+    raise ValueError(f"Unknown provider: {provider}")
@@ -0,0 +1,223 @@
+"""
+Adaptive retry policy for TTS requests
+
+Failures are classified so each kind gets its own retry budget:
+
+- rate_limited: HTTP 429 (honours ``Retry-After``)
+- server_error: HTTP 5xx
+- blocked: an HTML page instead of audio (Cloudflare challenge)
+- network: connection errors and timeouts
+- client_error: any other 4xx, never retried
+
+Backoff is exponential with full jitter; a server's ``Retry-After`` is
+always honoured in full. A shared circuit breaker stops all workers from
+hammering the API after a run of consecutive failures: callers wait out the
+cooldown, then one half-open trial request decides whether it closes again.
+Client errors say nothing about the API's health and never trip it.
+"""
+
+import email.utils
+import random
+import threading
+import time
+
+import requests
+
+DEFAULT_BUDGETS = {
+    'rate_limited': 8,
+    'server_error': 4,
+    'blocked': 3,
+    'network': 4,
+    'client_error': 0,
+}
+
+
+class TTSError(Exception):
+    """A failed TTS request, tagged with its error class"""
+
+    def __init__(self, message, error_class, status=None, retry_after=None):
+        super().__init__(message)
+        self.error_class = error_class
+        self.status = status
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def raise_for_response(response):
+    """Raise a classified TTSError unless ``response`` carries audio"""
+    content_type = response.headers.get('Content-Type', '')
+    if response.ok and 'text/html' not in content_type:
+        return
+    if 'text/html' in content_type:
+        error_class = 'blocked'
+    elif response.status_code == 429:
+        error_class = 'rate_limited'
+    elif response.status_code >= 500:
+        error_class = 'server_error'
+    else:
+        error_class = 'client_error'
+    raise TTSError(
+        f"Speech generation failed: {response.status_code} {response.text[:200]}",
+        error_class,
+        status=response.status_code,
+        retry_after=parse_retry_after(response.headers.get('Retry-After')),
+    )
+
+
+def classify(error):
+    """Error class of an exception, or None if it should not be retried"""
+    if isinstance(error, TTSError):
+        return error.error_class
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return 'network'
+    return None
+
+
+# How often callers check on a half-open trial in flight
+TRIAL_POLL_SECONDS = 0.25
+
+
+class CircuitBreaker:
+    """Opens after ``threshold`` consecutive failures and lets one trial through after ``cooldown`` seconds"""
+
+    def __init__(self, threshold=8, cooldown=30.0):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+        self.lock = threading.Lock()
+
+    def admit(self):
+        """
+        Seconds to wait before a request may be sent, or 0 once it is admitted
+
+        While open this is the rest of the cooldown. After it, the first caller
+        is admitted as the half-open trial and the others poll until the trial
+        closes the breaker or opens it again.
+        """
+        with self.lock:
+            if self.opened_at is None:
+                return 0.0
+            remaining = self.cooldown - (time.monotonic() - self.opened_at)
+            if remaining > 0:
+                return remaining
+            if self.trial_in_flight:
+                return min(self.cooldown, TRIAL_POLL_SECONDS)
+            self.trial_in_flight = True
+            return 0.0
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_in_flight = False
+
+    def release_trial(self):
+        """Let another trial through after one ended without a verdict"""
+        with self.lock:
+            self.trial_in_flight = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            self.trial_in_flight = False
+            if self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+
+
+class RetryPolicy:
+    """Jittered exponential backoff with per-error-class budgets, shared across worker threads"""
+
+    def __init__(self, base_delay=1.0, max_delay=60.0, budgets=None, breaker=None, sleep=time.sleep):
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budgets = dict(DEFAULT_BUDGETS, **(budgets or {}))
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        self.sleep = sleep
+        self.lock = threading.Lock()
+        self.retries = {error_class: 0 for error_class in self.budgets}
+        self.backoff_seconds = 0.0
+        self.circuit_seconds = 0.0
+        self.gave_up = 0
+
+    def delay(self, attempt, error):
+        """Seconds to wait before retry number ``attempt`` (0-based)"""
+        retry_after = getattr(error, 'retry_after', None)
+        if retry_after is not None:
+            # The server knows when it takes requests again; max_delay only caps our own backoff
+            return retry_after + random.uniform(0, self.base_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def call(self, fn, *args, **kwargs):
+        """Call ``fn`` until it succeeds or its error class runs out of retries, waiting out an open breaker"""
+        attempts = {}
+        while True:
+            wait = self.breaker.admit()
+            if wait:
+                with self.lock:
+                    self.circuit_seconds += wait
+                self.sleep(wait)
+                continue
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as error:
+                error_class = classify(error)
+                if error_class in (None, 'rate_limited', 'client_error'):
+                    # A 429 means the API is up but busy and a 4xx is the request's own fault;
+                    # only real failures trip the breaker
+                    self.breaker.release_trial()
+                else:
+                    self.breaker.record_failure()
+                if error_class is None:
+                    raise
+                attempt = attempts.get(error_class, 0)
+                if attempt >= self.budgets.get(error_class, 0):
+                    with self.lock:
+                        self.gave_up += 1
+                    raise
+                attempts[error_class] = attempt + 1
+                wait = self.delay(attempt, error)
+                with self.lock:
+                    self.retries[error_class] = self.retries.get(error_class, 0) + 1
+                    self.backoff_seconds += wait
+                print(f"   ⚠️  {error_class} (retry {attempt + 1}/{self.budgets[error_class]} in {wait:.1f}s): {error}")
+                self.sleep(wait)
+                continue
+            self.breaker.record_success()
+            return result
+
+    def stats(self):
+        with self.lock:
+            return {
+                'retries': dict(self.retries),
+                'backoff_seconds': self.backoff_seconds,
+                'circuit_seconds': self.circuit_seconds,
+                'gave_up': self.gave_up,
+            }
+
+    def report(self):
+        """Print retry counters for this run"""
+        stats = self.stats()
+        total = sum(stats['retries'].values())
+        detail = ", ".join(f"{name} {count}" for name, count in stats['retries'].items() if count)
+        print(f"🔁 Retries: {total}{f' ({detail})' if detail else ''}, "
+              f"{stats['backoff_seconds']:.0f}s backing off, {stats['circuit_seconds']:.0f}s waiting on the "
+              f"circuit breaker, {stats['gave_up']} gave up")
+
+
+DEFAULT_POLICY = RetryPolicy()
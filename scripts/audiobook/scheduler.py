@@ -0,0 +1,267 @@
+"""
+Book-level scheduler that runs every chapter's chunks through one worker pool
+
+Instead of generating chapters one after another (and idling the API while
+each chapter is assembled), all queued chapters, in any language, share a
+single queue of chunk jobs:
+
+- workers always pick the next chunk of the chapter with the fewest
+  characters left, so chapters finish early and steadily
+- a separate assembler thread appends finished chunks to each chapter's
+  MP3 and finalizes it, overlapping concatenation with synthesis
+- each finished chapter gets a sidecar index of its chunks' byte and time
+  offsets; in incremental renders, unchanged chunks are copied from the
+  previous chapter file by that index rather than re-read from their chunk
+  files
+- progress is reported with an ETA based on the measured characters per
+  second of this run
+"""
+
+import queue
+import threading
+import time
+
+from audiobook.index import index_path, reusable_ranges, write_index
+from audiobook.metrics import DEFAULT_METRICS
+from audiobook.mp3 import OrderedMP3Writer
+from audiobook.synthesis import DEFAULT_CONCURRENCY, rate_limiter_for_quota, request_gate
+
+
+def format_duration(seconds):
+    """Human-readable duration such as '1h05m', '12m30s' or '45s'"""
+    seconds = int(round(seconds))
+    hours, remainder = divmod(seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    if hours:
+        return f"{hours}h{minutes:02d}m"
+    if minutes:
+        return f"{minutes}m{seconds:02d}s"
+    return f"{seconds}s"
+
+
+class ChapterJob:
+    """
+    One chapter to generate: its manifest, text chunks and output file
+
+    ``synthesize`` has the same contract as in ``JobManifest.synthesize_chunk``:
+    it takes a chunk's text and returns audio bytes, or with ``stream=True``
+    takes ``(text, file)`` and writes the audio into ``file``. ``timings``
+    collects ``(characters, seconds)`` for every chunk synthesized this run,
+    and ``finished_seconds`` when the chapter was done, from the run's start.
+    ``text`` is the normalized chapter text the chunks were cut from, used
+    for the text offsets in the sidecar index. With ``incremental=True``,
+    chunks already in the previous chapter file (same text and synthesis
+    settings, per its index) are reused from it.
+    """
+
+    def __init__(self, manifest, chapter_number, chunks, synthesize, output_path, stream=False, text=None,
+                 incremental=False):
+        self.manifest = manifest
+        self.chapter_number = chapter_number
+        self.chunks = chunks
+        self.synthesize = synthesize
+        self.output_path = output_path
+        self.stream = stream
+        self.text = text
+        self.incremental = incremental
+        self.label = f"{manifest.language}/{str(chapter_number).zfill(2)}"
+        self.pending = []
+        self.remaining_chars = 0
+        self.generated = 0
+        self.timings = []
+        self.writer = None
+        self.error = None
+        self.finished = False
+        self.finished_seconds = None
+
+
+class BookScheduler:
+    """
+    Shortest-remaining-chapter-first scheduler over a shared worker pool
+
+    Args:
+        concurrency: Number of requests in flight across all chapters
+        rate_limiter: Object with an ``acquire()`` method called before each request (not on cache hits)
+        on_chunk: Callback ``(job, index, path)`` run as each chunk is saved
+        on_chapter: Callback ``(job, error)`` run when a chapter is finished or has failed
+    """
+
+    def __init__(self, concurrency=DEFAULT_CONCURRENCY, rate_limiter=None, on_chunk=None, on_chapter=None):
+        self.concurrency = max(1, concurrency)
+        self.rate_limiter = rate_limiter if rate_limiter is not None else rate_limiter_for_quota(concurrency)
+        self.on_chunk = on_chunk or self.print_chunk
+        self.on_chapter = on_chapter or self.print_chapter
+        self.jobs = []
+        self.lock = threading.Lock()
+        self.assembly = queue.Queue()
+        self.started_at = None
+        self.chars_total = 0
+        self.chars_done = 0
+        self.completed = []
+        self.failed = []
+
+    def add(self, job):
+        self.jobs.append(job)
+
+    def _plan(self):
+        """Find each chapter's pending chunks and queue its finished ones for assembly"""
+        for job in self.jobs:
+            pending = job.manifest.plan_chapter(job.chapter_number, job.chunks)
+            # Chunks still in the previous chapter file are spliced from it, even without a chunk file
+            ranges = reusable_ranges(job.output_path, job.chunks, job.manifest.settings) if job.incremental else {}
+            job.pending = [index for index in pending if index not in ranges]
+            job.remaining_chars = sum(len(job.chunks[index]) for index in job.pending)
+            self.chars_total += job.remaining_chars
+            job.writer = OrderedMP3Writer(job.output_path, len(job.chunks))
+            pending = set(job.pending)
+            paths = job.manifest.chunk_paths(job.chapter_number)
+            reused = [index for index in range(len(job.chunks)) if index not in pending]
+            for index in reused:
+                self.assembly.put((job, index, ranges.get(index) or paths[index]))
+            if not job.chunks:
+                self.assembly.put((job, None, None))
+
+    def _next_chunk(self):
+        """Take the next chunk of the chapter with the fewest characters left"""
+        with self.lock:
+            candidates = [job for job in self.jobs if job.pending and job.error is None]
+            if not candidates:
+                return None
+            job = min(candidates, key=lambda job: job.remaining_chars)
+            return job, job.pending.pop(0)
+
+    def _fail(self, job, error):
+        with self.lock:
+            if job.error is not None:
+                return
+            job.error = error
+            # Chunks already in flight still finish and count towards progress
+            dropped = sum(len(job.chunks[index]) for index in job.pending)
+            job.pending = []
+            job.remaining_chars -= dropped
+            self.chars_total -= dropped
+        self.assembly.put((job, None, error))
+
+    def _work(self):
+        while True:
+            item = self._next_chunk()
+            if item is None:
+                return
+            job, index = item
+            text = job.chunks[index]
+            started = time.monotonic()
+            try:
+                # Tokens are taken by the provider client only when a request is sent, not on cache hits
+                with request_gate(self.rate_limiter), \
+                        DEFAULT_METRICS.timer('chunk', chapter=job.label, index=index, chars=len(text)):
+                    path = job.manifest.synthesize_chunk(job.chapter_number, index, text, job.synthesize,
+                                                         stream=job.stream)
+            except Exception as error:
+                with self.lock:
+                    job.remaining_chars -= len(text)
+                    self.chars_total -= len(text)
+                self._fail(job, error)
+                continue
+            with self.lock:
+                job.remaining_chars -= len(text)
+                job.generated += 1
+                job.timings.append((len(text), time.monotonic() - started))
+                self.chars_done += len(text)
+            self.assembly.put((job, index, path))
+            self.on_chunk(job, index, path)
+
+    def _assemble(self):
+        """Append finished chunks to their chapter files and finalize completed chapters"""
+        while True:
+            item = self.assembly.get()
+            if item is None:
+                return
+            job, index, result = item
+            if job.finished:
+                continue
+            try:
+                if isinstance(result, Exception):
+                    raise result
+                if result is not None:
+                    job.writer.add(index, result)
+                if not job.writer.complete:
+                    continue
+                # The old index must not outlive the file it describes
+                index_path(job.output_path).unlink(missing_ok=True)
+                job.writer.finish()
+                write_index(job.output_path, job.chunks, job.writer.segments, job.text, job.manifest.settings)
+                job.manifest.mark_chapter_complete(job.chapter_number, job.output_path)
+            except Exception as error:
+                job.finished = True
+                job.writer.abort()
+                self._fail(job, error)
+                self.failed.append((job, error))
+                self.on_chapter(job, error)
+                continue
+            job.finished = True
+            job.finished_seconds = time.monotonic() - self.started_at
+            self.completed.append((job, job.output_path))
+            self.on_chapter(job, None)
+
+    def run(self):
+        """
+        Generate every queued chapter
+
+        Returns:
+            (completed, failed): lists of ``(job, output_path)`` and ``(job, error)``
+        """
+        self.started_at = time.monotonic()
+        assembler = threading.Thread(target=self._assemble, name="audiobook-assembler")
+        workers = [threading.Thread(target=self._work, name=f"audiobook-worker-{i}", daemon=True)
+                   for i in range(self.concurrency)]
+        try:
+            self._plan()
+            assembler.start()
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+        except BaseException:
+            # Let in-flight chunks finish; the manifest keeps them for the next run
+            with self.lock:
+                for job in self.jobs:
+                    job.pending = []
+            raise
+        finally:
+            if assembler.is_alive():
+                self.assembly.put(None)
+                assembler.join()
+            # Chapters cut short by an interrupt leave no .part file or open handle behind
+            for job in self.jobs:
+                if job.writer is not None and not job.finished:
+                    job.writer.abort()
+        return self.completed, self.failed
+
+    def progress(self):
+        """Characters done and queued this run, measured chars/second and ETA in seconds"""
+        with self.lock:
+            elapsed = time.monotonic() - self.started_at
+            rate = self.chars_done / elapsed if self.chars_done and elapsed > 0 else None
+            remaining = self.chars_total - self.chars_done
+            return {
+                'chars_done': self.chars_done,
+                'chars_total': self.chars_total,
+                'chars_per_second': rate,
+                'eta_seconds': remaining / rate if rate else None,
+            }
+
+    def print_chunk(self, job, index, path):
+        progress = self.progress()
+        percent = 100 * progress['chars_done'] / progress['chars_total'] if progress['chars_total'] else 100
+        rate = progress['chars_per_second']
+        eta = format_duration(progress['eta_seconds']) if rate else "?"
+        print(f"✅ {job.label} chunk {index + 1}/{len(job.chunks)} ({path.stat().st_size} bytes) · "
+              f"{percent:.0f}% · {rate or 0:.0f} chars/s · ETA {eta}")
+
+    def print_chapter(self, job, error):
+        if error is not None:
+            print(f"❌ Chapter {job.label} failed: {error}")
+            return
+        reused = len(job.chunks) - job.generated
+        print(f"📗 Chapter {job.label} complete: {job.output_path} "
+              f"({job.writer.duration / 60:.1f} minutes, {job.generated} chunks generated, {reused} reused)")
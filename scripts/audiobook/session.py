@@ -0,0 +1,49 @@
+"""
+Pooled keep-alive HTTP session shared by the TTS scripts
+"""
+
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from audiobook.synthesis import DEFAULT_CONCURRENCY
+
+# Keep one connection per in-flight request so workers never wait on the pool
+POOL_SIZE = int(os.environ.get("TTS_POOL_SIZE", str(DEFAULT_CONCURRENCY)))
+CONNECT_TIMEOUT = float(os.environ.get("TTS_CONNECT_TIMEOUT", "10"))
+READ_TIMEOUT = float(os.environ.get("TTS_READ_TIMEOUT", "120"))
+TIMEOUT = (CONNECT_TIMEOUT, READ_TIMEOUT)
+
+_session = None
+_lock = threading.Lock()
+
+
+def create_session(pool_size=POOL_SIZE):
+    """Create a session whose adapters keep ``pool_size`` connections alive per host"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(1, pool_size), pool_block=True)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session():
+    """Return the process-wide session, creating it on first use"""
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = create_session()
+    return _session
+
+
+def configure(pool_size):
+    """Resize the shared pool, e.g. to match a --concurrency option"""
+    global _session
+    with _lock:
+        if _session is not None:
+            _session.close()
+        _session = create_session(pool_size)
+    return _session
@@ -0,0 +1,240 @@
+"""
+Local stand-ins for the ElevenLabs text-to-speech API and the Chatterbox service
+
+Serves ``POST /v1/text-to-speech/{voice_id}`` and its ``/stream`` variant with
+silent MP3 audio whose length is proportional to the request text, so the
+pipeline can be exercised without spending credits:
+
+    python scripts/audiobook/stub_server.py --port 8765
+    ELEVENLABS_API_BASE=http://127.0.0.1:8765 python scripts/regenerate_elevenlabs.py
+
+Responses can be slowed down and made unreliable to look like the real API
+under load: a fixed latency plus generation time per character, random
+jitter, a share of HTTP 429 responses and larger or smaller payloads.
+``StubChatterboxClient`` does the same for ``modal_chatterbox.ChatterboxClient``
+without Modal or a GPU, and ``stub_generate`` stands in for one model call in
+a worker process.
+"""
+
+import argparse
+import io
+import json
+import random
+import threading
+import time
+import wave
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# One MPEG-1 Layer III frame: 128 kbps, 44.1 kHz, joint stereo, all-zero
+# side info (decodes as silence). 1152 samples ≈ 26 ms.
+FRAME_HEADER = b'\xff\xfb\x90\x40'
+FRAME_LENGTH = 417
+FRAME_SECONDS = 1152 / 44100
+SILENT_FRAME = FRAME_HEADER + bytes(FRAME_LENGTH - len(FRAME_HEADER))
+
+# Roughly how fast a narrator reads, used to size the fake audio
+CHARS_PER_SECOND = 15
+
+
+def silent_frames(text, scale=1.0):
+    """Number of MP3 frames ``silent_mp3`` returns for ``text``"""
+    return max(1, int(len(text) / CHARS_PER_SECOND / FRAME_SECONDS * scale))
+
+
+def silent_mp3(text, scale=1.0):
+    """Silent MP3 audio about as long as ``text`` would take to read aloud (times ``scale``)"""
+    return SILENT_FRAME * silent_frames(text, scale)
+
+
+def silent_wav(text, sample_rate=24000):
+    """Silent 16-bit mono WAV audio about as long as ``text`` would take to read aloud"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(bytes(2 * int(len(text) / CHARS_PER_SECOND * sample_rate)))
+    return buffer.getvalue()
+
+
+def generation_seconds(text, latency, seconds_per_char, jitter):
+    """Simulated time to answer a request: fixed latency, time per character and random jitter"""
+    return max(0.0, latency + seconds_per_char * len(text) + random.uniform(-jitter, jitter))
+
+
+def stub_generate(text, latency=0.05, seconds_per_char=0.0005, jitter=0.0, straggler_rate=0.0,
+                  straggler_slowdown=10.0):
+    """
+    Silent WAV for ``text`` after a simulated generation delay
+
+    A share ``straggler_rate`` of calls run ``straggler_slowdown`` times
+    slower, like a request stuck on a busy or degraded worker.
+    """
+    seconds = generation_seconds(text, latency, seconds_per_char, jitter)
+    if straggler_rate and random.random() < straggler_rate:
+        seconds *= straggler_slowdown
+    time.sleep(seconds)
+    return silent_wav(text)
+
+
+class StubTTSHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        path = self.path.split('?', 1)[0]
+        parts = path.strip('/').split('/')
+        if len(parts) < 3 or parts[:2] != ['v1', 'text-to-speech']:
+            self.send_error(404)
+            return
+        length = int(self.headers.get('Content-Length', 0))
+        payload = json.loads(self.rfile.read(length) or b'{}')
+        text = payload.get('text', '')
+        server = self.server
+
+        if server.error_rate and random.random() < server.error_rate:
+            server.count('rate_limited')
+            time.sleep(server.latency)
+            body = b'{"detail": {"status": "too_many_concurrent_requests"}}'
+            self.send_response(429)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            if server.retry_after is not None:
+                self.send_header('Retry-After', str(server.retry_after))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        audio = silent_mp3(text, server.payload_scale)
+        server.count('requests_served')
+        generating = generation_seconds(text, 0.0, server.seconds_per_char, server.jitter)
+        time.sleep(server.latency)
+
+        if parts[-1] == 'stream':
+            self.send_response(200)
+            self.send_header('Content-Type', 'audio/mpeg')
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            block_size = FRAME_LENGTH * 32
+            blocks = max(1, -(-len(audio) // block_size))
+            for start in range(0, len(audio), block_size):
+                # Audio arrives as it is generated
+                time.sleep(generating / blocks)
+                block = audio[start:start + block_size]
+                self.wfile.write(f"{len(block):X}\r\n".encode() + block + b"\r\n")
+            self.wfile.write(b"0\r\n\r\n")
+        else:
+            time.sleep(generating)
+            self.send_response(200)
+            self.send_header('Content-Type', 'audio/mpeg')
+            self.send_header('Content-Length', str(len(audio)))
+            self.end_headers()
+            self.wfile.write(audio)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubTTSServer(ThreadingHTTPServer):
+    """
+    Threaded stand-in server; use as a context manager to run it in the background
+
+    Args:
+        latency: Seconds before every response (round trip and queueing)
+        seconds_per_char: Generation time per character of text
+        jitter: Up to this many seconds are randomly added to or removed from generation time
+        error_rate: Share of requests answered with HTTP 429
+        retry_after: Retry-After header sent with 429 responses (None to omit it)
+        payload_scale: Multiplier for the size (and length) of the returned audio
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host="127.0.0.1", port=0, handler=StubTTSHandler, latency=0.0, seconds_per_char=0.0,
+                 jitter=0.0, error_rate=0.0, retry_after=None, payload_scale=1.0):
+        super().__init__((host, port), handler)
+        self.latency = latency
+        self.seconds_per_char = seconds_per_char
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.payload_scale = payload_scale
+        self.requests_served = 0
+        self.rate_limited = 0
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def count(self, counter):
+        with self.lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+
+class StubChatterboxClient:
+    """
+    In-process stand-in for ``modal_chatterbox.ChatterboxClient``
+
+    Each call waits for one of ``containers`` GPU slots (a container runs one
+    generation at a time), then for the round trip and model time for the
+    text, and returns silent WAV audio of the narration's length. The audio
+    is always WAV whatever ``audio_format`` asks for; ffmpeg detects the
+    container when transcoding.
+    """
+
+    def __init__(self, containers=1, latency=0.25, seconds_per_char=0.0005, jitter=0.0):
+        self.slots = threading.BoundedSemaphore(max(1, containers))
+        self.latency = latency
+        self.seconds_per_char = seconds_per_char
+        self.jitter = jitter
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def upload_voice(self, voice_name, wav_path):
+        return {"success": True, "voice_name": voice_name}
+
+    def synthesize(self, text, voice_name="marco", audio_format="flac"):
+        with self.slots:
+            time.sleep(generation_seconds(text, self.latency, self.seconds_per_char, self.jitter))
+        with self.lock:
+            self.calls += 1
+        return silent_wav(text)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local stand-in for the ElevenLabs TTS API")
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds before every response")
+    parser.add_argument('--seconds-per-char', type=float, default=0.0, help="generation time per character")
+    parser.add_argument('--jitter', type=float, default=0.0, help="random +/- seconds of generation time")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="share of requests answered with 429")
+    parser.add_argument('--retry-after', type=int, help="Retry-After seconds sent with 429 responses")
+    parser.add_argument('--payload-scale', type=float, default=1.0, help="multiplier for the audio size")
+    args = parser.parse_args()
+
+    server = StubTTSServer(args.host, args.port, latency=args.latency, seconds_per_char=args.seconds_per_char,
+                           jitter=args.jitter, error_rate=args.error_rate, retry_after=args.retry_after,
+                           payload_scale=args.payload_scale)
+    print(f"🧪 Stub TTS server listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Request concurrency and pacing shared by the audiobook generation scripts
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from audiobook.metrics import DEFAULT_METRICS
+
+# ElevenLabs limits how many requests an account may have in flight at once
+# (Free 2, Starter 3, Creator 5, Pro 10). Match this to the account tier.
+DEFAULT_CONCURRENCY = int(os.environ.get("TTS_CONCURRENCY", "3"))
+
+# Request starts per second; defaults to one per concurrency slot
+_CONFIGURED_REQUESTS_PER_SECOND = os.environ.get("TTS_REQUESTS_PER_SECOND")
+DEFAULT_REQUESTS_PER_SECOND = float(_CONFIGURED_REQUESTS_PER_SECOND or DEFAULT_CONCURRENCY)
+
+
+class TokenBucket:
+    """Thread-safe token bucket that paces request starts"""
+
+    def __init__(self, rate, capacity=None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then take it"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def rate_limiter_for_quota(concurrency=DEFAULT_CONCURRENCY, requests_per_second=None):
+    """
+    Build a token bucket sized to the account's concurrency quota
+
+    The bucket holds ``concurrency`` tokens and refills at
+    ``requests_per_second``, else TTS_REQUESTS_PER_SECOND if set, else
+    ``concurrency`` per second, so --concurrency sets the request rate too.
+    """
+    rate = requests_per_second or (DEFAULT_REQUESTS_PER_SECOND if _CONFIGURED_REQUESTS_PER_SECOND else concurrency)
+    return TokenBucket(rate, capacity=concurrency)
+
+
+_gate = threading.local()
+
+
+@contextmanager
+def request_gate(rate_limiter):
+    """Make ``before_request`` on this thread wait on ``rate_limiter`` for the duration of the block"""
+    previous = getattr(_gate, 'rate_limiter', None)
+    _gate.rate_limiter = rate_limiter
+    try:
+        yield
+    finally:
+        _gate.rate_limiter = previous
+
+
+def before_request():
+    """
+    Take a rate-limit token for a request about to be sent
+
+    Called by the provider clients right before each request (retries
+    included), after the audio cache missed, so cache hits cost no tokens.
+    Does nothing outside ``request_gate``.
+
+    Returns:
+        Seconds spent waiting, for callers to leave out of request latency
+    """
+    rate_limiter = getattr(_gate, 'rate_limiter', None)
+    if rate_limiter is None:
+        return 0.0
+    with DEFAULT_METRICS.timer('rate_wait'):
+        start = time.monotonic()
+        rate_limiter.acquire()
+        return time.monotonic() - start
+
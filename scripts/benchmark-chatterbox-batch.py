@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-chunk vs. one-request Chatterbox generation on CPU with a stub model
+
+ChatterboxTurboTTS generates one text per model call, so ``generate_batch``
+does not batch on the GPU: it amortizes the per-request costs over a whole
+chapter. The stub mimics those costs: a Modal round trip per remote call,
+re-reading and conditioning the voice prompt, and model time that grows
+with text length. Runs locally without a GPU, Modal or Modal credentials:
+
+    python scripts/benchmark-chatterbox-batch.py --chapter 1
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from audiobook.amortized import generate_many
+from audiobook.chunker import chunk_text
+from audiobook.normalize import chapter_path, load_normalized
+
+# Simulated costs in seconds (scaled by --time-scale)
+ROUND_TRIP = 0.25          # Modal call overhead + payload transfer
+PROMPT_CONDITIONING = 0.2  # Load reference WAV + compute speaker embedding
+CALL_OVERHEAD = 0.05       # Fixed cost per model forward pass
+SECONDS_PER_CHAR = 0.0005  # Autoregressive decoding cost
+
+
+class StubChatterbox:
+    """CPU stand-in for ChatterboxTurboTTS that sleeps instead of running the model"""
+
+    sr = 24000
+
+    def __init__(self, time_scale=1.0):
+        self.time_scale = time_scale
+        self.conds = None
+
+    def _wait(self, seconds):
+        time.sleep(seconds * self.time_scale)
+
+    def prepare_conditionals(self, wav_fpath):
+        self._wait(PROMPT_CONDITIONING)
+        self.conds = wav_fpath
+
+    def generate(self, text, audio_prompt_path=None):
+        if audio_prompt_path is not None:
+            self.prepare_conditionals(audio_prompt_path)
+        self._wait(CALL_OVERHEAD + SECONDS_PER_CHAR * len(text))
+        return len(text)
+
+
+def run_per_chunk(model, texts, voice_path):
+    results = []
+    for text in texts:
+        model._wait(ROUND_TRIP)
+        results.append(model.generate(text, audio_prompt_path=voice_path))
+    return results
+
+
+def run_per_chunk_cached(model, texts, voice_path):
+    """Per-chunk calls against a container that keeps the voice conditioning warm"""
+    model.prepare_conditionals(voice_path)
+    results = []
+    for text in texts:
+        model._wait(ROUND_TRIP)
+        results.append(model.generate(text))
+    return results
+
+
+def run_one_request(model, texts, voice_path):
+    """The whole chapter in one ``generate_batch`` call"""
+    model._wait(ROUND_TRIP)
+    model.prepare_conditionals(voice_path)
+    return generate_many(model, texts, model.conds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-chunk vs. one-request Chatterbox generation")
+    parser.add_argument('--chapter', type=int, default=1)
+    parser.add_argument('--lang', choices=['en', 'pt'], default='en')
+    parser.add_argument('--chunks', type=int, default=0, help="limit the number of chunks (0 = whole chapter)")
+    parser.add_argument('--time-scale', type=float, default=0.1, help="multiply simulated costs (1.0 = realistic)")
+    args = parser.parse_args()
+
+    text = load_normalized(chapter_path(args.lang, args.chapter))
+    texts = chunk_text(text, max_chars=600, lang=args.lang)
+    if args.chunks:
+        texts = texts[:args.chunks]
+    voice_path = "/voices/marco.wav"
+    total_chars = sum(len(t) for t in texts)
+
+    print(f"📚 Chapter {args.chapter} ({args.lang}): {len(texts)} chunks, {total_chars} characters")
+    print(f"⏱️  Time scale {args.time_scale}x")
+    print("=" * 60)
+
+    expected = [len(t) for t in texts]
+    scenarios = [
+        ("per-chunk calls", lambda: run_per_chunk(StubChatterbox(args.time_scale), texts, voice_path)),
+        ("per-chunk, cached voice", lambda: run_per_chunk_cached(StubChatterbox(args.time_scale), texts, voice_path)),
+        ("one request per chapter", lambda: run_one_request(StubChatterbox(args.time_scale), texts, voice_path)),
+    ]
+    baseline = None
+    for name, run in scenarios:
+        start = time.perf_counter()
+        results = run()
+        elapsed = time.perf_counter() - start
+        if results != expected:
+            raise Exception(f"{name}: results out of order")
+        baseline = baseline or elapsed
+        print(f"{name:<26} {elapsed:7.2f}s  {total_chars / elapsed:8.0f} chars/s  {baseline / elapsed:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
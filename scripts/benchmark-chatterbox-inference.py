@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark Chatterbox Turbo's default and optimized inference modes on CPU
+
+Loads the real model (chatterbox-tts and torch must be installed; no GPU or
+Modal credentials needed), generates the same chunks of a chapter in the
+default mode and then in the optimized mode of modal_chatterbox.py, and
+reports the real-time factor (generation seconds per second of audio) of
+each. Sampling differs between runs, so quality is checked per chunk by
+comparing the two outputs' average log-mel spectra and speaker embeddings
+and their lengths; the script fails if any chunk drifts too far:
+
+    python scripts/benchmark-chatterbox-inference.py --chapter 1 --chunks 3
+    python scripts/benchmark-chatterbox-inference.py --cpu-dtype bfloat16 --voice /tmp/voice_sample.wav
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(Path(__file__).parent))
+
+import modal_chatterbox
+from audiobook.chunker import chunk_text
+from audiobook.normalize import chapter_path, load_normalized
+from modal_chatterbox import STREAM_MAX_CHARS, _inference_context, _optimize_model
+
+
+def spectrum_similarity(a, b, sample_rate):
+    """Correlation of the average log-mel spectra of two waveforms (1.0 = same timbre and balance)"""
+    import torch
+    import torchaudio
+
+    mel = torchaudio.transforms.MelSpectrogram(sample_rate=sample_rate, n_mels=80)
+    spectra = [torch.log(mel(wav) + 1e-6).mean(dim=-1) for wav in (a, b)]
+    centered = [spectrum - spectrum.mean() for spectrum in spectra]
+    return float(torch.nn.functional.cosine_similarity(centered[0], centered[1], dim=0))
+
+
+def speaker_similarity(model, a, b):
+    """Cosine similarity of the voice encoder's embeddings of two waveforms, or None if unavailable"""
+    import numpy as np
+
+    try:
+        embeds = model.ve.embeds_from_wavs([a.numpy(), b.numpy()], sample_rate=model.sr)
+    except Exception:
+        return None
+    embeds = np.asarray(embeds)
+    return float(np.dot(embeds[0], embeds[1]) / (np.linalg.norm(embeds[0]) * np.linalg.norm(embeds[1])))
+
+
+def run(model, texts, mode, seed):
+    """Generate every text in ``mode``; returns ``[(seconds, waveform)]``"""
+    import torch
+
+    # Warm-up; in the optimized mode this is where torch.compile does its work
+    with _inference_context("cpu", mode):
+        model.generate(texts[0][:100])
+    results = []
+    for i, text in enumerate(texts):
+        torch.manual_seed(seed + i)
+        start = time.perf_counter()
+        with _inference_context("cpu", mode):
+            wav = model.generate(text)
+        results.append((time.perf_counter() - start, wav.detach().float().squeeze(0)))
+        print(f"   {mode:<9} chunk {i + 1}/{len(texts)}: {results[-1][0]:6.1f}s")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare Chatterbox inference modes on CPU")
+    parser.add_argument('--chapter', type=int, default=1)
+    parser.add_argument('--lang', choices=['en', 'pt'], default='en')
+    parser.add_argument('--chunks', type=int, default=3, help="chunks of the chapter to generate")
+    parser.add_argument('--voice', help="WAV voice sample to condition on (default: the model's built-in voice)")
+    parser.add_argument('--cpu-dtype', choices=['float32', 'bfloat16'], default=modal_chatterbox.CPU_DTYPE)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--min-similarity', type=float, default=0.9,
+                        help="lowest spectrum and speaker similarity allowed per chunk (default: 0.9)")
+    parser.add_argument('--max-length-change', type=float, default=0.3,
+                        help="largest relative change in a chunk's length allowed (default: 0.3)")
+    args = parser.parse_args()
+
+    import torch
+    from chatterbox.tts_turbo import ChatterboxTurboTTS
+
+    modal_chatterbox.CPU_DTYPE = args.cpu_dtype
+    texts = chunk_text(load_normalized(chapter_path(args.lang, args.chapter)), max_chars=STREAM_MAX_CHARS,
+                       lang=args.lang)[:args.chunks]
+    print(f"📚 Chapter {args.chapter} ({args.lang}): {len(texts)} chunks, {sum(map(len, texts))} characters")
+    print(f"🧵 torch {torch.__version__}, {torch.get_num_threads()} threads, optimized CPU dtype {args.cpu_dtype}")
+
+    model = ChatterboxTurboTTS.from_pretrained(device="cpu")
+    if args.voice:
+        model.prepare_conditionals(args.voice)
+
+    default = run(model, texts, "default", args.seed)
+    _optimize_model(model, "cpu", "optimized")
+    optimized = run(model, texts, "optimized", args.seed)
+
+    print("=" * 60)
+    problems = []
+    print(f"{'Chunk':>5} {'Default RTF':>12} {'Optimized RTF':>14} {'Spectrum':>9} {'Speaker':>8} {'Length':>7}")
+    for i, ((before_seconds, before), (after_seconds, after)) in enumerate(zip(default, optimized)):
+        before_audio = before.shape[-1] / model.sr
+        after_audio = after.shape[-1] / model.sr
+        spectrum = spectrum_similarity(before, after, model.sr)
+        speaker = speaker_similarity(model, before, after)
+        change = after_audio / before_audio - 1 if before_audio else 0.0
+        print(f"{i + 1:>5} {before_seconds / before_audio:>12.2f} {after_seconds / after_audio:>14.2f} "
+              f"{spectrum:>9.3f} {'n/a' if speaker is None else format(speaker, '.3f'):>8} {change:>+7.0%}")
+        if spectrum < args.min_similarity:
+            problems.append(f"chunk {i + 1}: spectrum similarity {spectrum:.3f}")
+        if speaker is not None and speaker < args.min_similarity:
+            problems.append(f"chunk {i + 1}: speaker similarity {speaker:.3f}")
+        if abs(change) > args.max_length_change:
+            problems.append(f"chunk {i + 1}: length changed {change:+.0%}")
+
+    rtf_default = sum(seconds for seconds, _ in default) / sum(wav.shape[-1] / model.sr for _, wav in default)
+    rtf_optimized = sum(seconds for seconds, _ in optimized) / sum(wav.shape[-1] / model.sr for _, wav in optimized)
+    print("=" * 60)
+    print(f"⏱️  Real-time factor: {rtf_default:.2f} default → {rtf_optimized:.2f} optimized "
+          f"({rtf_default / rtf_optimized:.2f}x faster)")
+    for problem in problems:
+        print(f"❌ {problem}")
+    if problems:
+        sys.exit(1)
+    print("✅ Optimized audio matches the default mode")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark fanning a chapter's chunks out to TTS workers, with and without straggler redistribution
+
+Runs ``audiobook.fanout`` over a local process pool whose workers sleep like
+a Chatterbox container (``stub_server.stub_generate``), with a share of
+calls made much slower. Which calls straggle (and their jitter) follows from
+--seed and the chunk and copy number alone, so both runs face the same
+schedule and a re-submitted copy draws its own. Checks that results come
+back complete and in order, and prints wall time and each worker's load:
+
+    python scripts/benchmark-fanout.py --chapter 1 --workers 4 --straggler-rate 0.1 --seed 7
+
+A local process cannot be stopped mid-call, so the losing copy of a
+redistributed straggler keeps its worker busy until it finishes (Modal
+cancels it); the local speedup is a lower bound.
+"""
+
+import argparse
+import io
+import random
+import sys
+import time
+import wave
+from collections import Counter
+from functools import partial
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from audiobook.chunker import chunk_text
+from audiobook.fanout import DEFAULT_STRAGGLER_FACTOR, FanOutStats, LocalExecutor, fan_out
+from audiobook.normalize import chapter_path, load_normalized
+from audiobook.providers import MAX_CHARS
+from audiobook.stub_server import CHARS_PER_SECOND, stub_generate
+
+
+def wav_seconds(audio):
+    with wave.open(io.BytesIO(audio), 'rb') as wav:
+        return wav.getnframes() / wav.getframerate()
+
+
+def seeded_generate(call, **kwargs):
+    """``stub_generate`` for a ``(text, seed)`` call, with its straggling and jitter drawn from ``seed``"""
+    text, seed = call
+    random.seed(seed)
+    return stub_generate(text, **kwargs)
+
+
+class SeededExecutor(LocalExecutor):
+    """``LocalExecutor`` over ``(index, text)`` items that seeds each call by seed, index and copy number"""
+
+    def __init__(self, function, workers, seed):
+        super().__init__(function, workers)
+        self.seed = seed
+        self.copies = Counter()
+
+    def submit(self, item):
+        index, text = item
+        copy = self.copies[index]
+        self.copies[index] += 1
+        return super().submit((text, f"{self.seed}:{index}:{copy}"))
+
+
+def run(name, texts, args, straggler_factor):
+    """Fan ``texts`` out once and return the wall time, or raise if results are missing or out of order"""
+    function = partial(seeded_generate, latency=args.latency, seconds_per_char=args.seconds_per_char,
+                       jitter=args.jitter, straggler_rate=args.straggler_rate,
+                       straggler_slowdown=args.straggler_slowdown)
+    stats = FanOutStats()
+    start = time.monotonic()
+    with SeededExecutor(function, args.workers, args.seed) as executor:
+        results = list(fan_out(list(enumerate(texts)), executor, size=lambda item: len(item[1]),
+                               straggler_factor=straggler_factor, stats=stats))
+    wall = time.monotonic() - start
+
+    if [index for index, _ in results] != list(range(len(texts))):
+        raise Exception(f"{name}: results out of order")
+    for (index, audio), text in zip(results, texts):
+        if abs(wav_seconds(audio) - len(text) / CHARS_PER_SECOND) > 0.01:
+            raise Exception(f"{name}: chunk {index} has the wrong audio")
+    print(f"🧪 {name}: {wall:.2f}s")
+    stats.report()
+    return wall
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark fan-out of TTS chunks to local stand-in workers")
+    parser.add_argument('--chapter', type=int, default=1)
+    parser.add_argument('--lang', choices=['en', 'pt'], default='en')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--latency', type=float, default=0.05, help="seconds per call before generation")
+    parser.add_argument('--seconds-per-char', type=float, default=0.0005, help="generation time per character")
+    parser.add_argument('--jitter', type=float, default=0.02, help="random +/- seconds per call")
+    parser.add_argument('--straggler-rate', type=float, default=0.1, help="share of calls that run slow")
+    parser.add_argument('--straggler-slowdown', type=float, default=10.0, help="how much slower a straggler is")
+    parser.add_argument('--straggler-factor', type=float, default=DEFAULT_STRAGGLER_FACTOR,
+                        help="re-submit calls taking this many times the median time per character")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the straggler and jitter schedule")
+    args = parser.parse_args()
+
+    texts = chunk_text(load_normalized(chapter_path(args.lang, args.chapter)), max_chars=MAX_CHARS['chatterbox'],
+                       lang=args.lang)
+    print(f"📚 Chapter {args.chapter} ({args.lang}): {len(texts)} chunks on {args.workers} workers, "
+          f"{args.straggler_rate:.0%} stragglers {args.straggler_slowdown:g}x slower (seed {args.seed})")
+    print("=" * 60)
+    without = run("no redistribution", texts, args, None)
+    print("=" * 60)
+    with_redistribution = run("straggler redistribution", texts, args, args.straggler_factor)
+    print("=" * 60)
+    print(f"✅ Results complete and in order; redistribution {without / with_redistribution:.2f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Benchmark the full audiobook pipeline offline against stand-in TTS services
+
+The real manuscripts go through normalization, chunking, the book scheduler,
+rate limiting, retries, the chunk manifest and MP3 assembly. ElevenLabs is
+replaced by the local stub server and Chatterbox by a stub client, so no
+credits or GPU time are spent. For each scenario the benchmark reports
+throughput and request latency, and checks that every chapter file has the
+expected length. Use --save and --compare to catch regressions:
+
+    python scripts/benchmark-pipeline.py --lang all --concurrency 3,6
+    python scripts/benchmark-pipeline.py --latency 0.3 --error-rate 0.05 --stream
+    python scripts/benchmark-pipeline.py --save /tmp/bench.json
+    python scripts/benchmark-pipeline.py --compare /tmp/bench.json
+"""
+
+import argparse
+import json
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from audiobook.cache import AudioCache
+from audiobook.cli import LANGUAGES, load_chapters
+from audiobook.manifest import JobManifest
+from audiobook.metrics import DEFAULT_METRICS
+from audiobook.providers import DEFAULT_VOICES, get_synthesizer, synthesis_key
+from audiobook.scheduler import BookScheduler, ChapterJob
+from audiobook.stub_server import (CHARS_PER_SECOND, FRAME_SECONDS, StubChatterboxClient, StubTTSServer,
+                                   silent_frames)
+from audiobook.synthesis import rate_limiter_for_quota
+
+# Allowed drift of a chapter's length from the audio the stubs returned, per chunk
+# (MP3 encoder padding for Chatterbox; nothing for ElevenLabs frames)
+DURATION_TOLERANCE = {
+    'elevenlabs': FRAME_SECONDS / 2,
+    'chatterbox': 0.2,
+}
+
+
+def expected_duration(provider, chunks, payload_scale):
+    """Length in seconds the stubs' audio for ``chunks`` adds up to"""
+    if provider == 'chatterbox':
+        return sum(len(chunk) / CHARS_PER_SECOND for chunk in chunks)
+    return sum(silent_frames(chunk, payload_scale) for chunk in chunks) * FRAME_SECONDS
+
+
+def run_scenario(name, provider, concurrency, chapters, args, stream=False, client=None):
+    """Render ``chapters`` once in a scratch directory and return the scenario's measurements"""
+    with tempfile.TemporaryDirectory(prefix="audiobook-bench-") as scratch:
+        scratch = Path(scratch)
+        DEFAULT_METRICS.open(scratch / "metrics.jsonl")
+        # A fresh cache is written to (its I/O is part of the pipeline) but never hit
+        cache = AudioCache(scratch / "cache")
+        synthesize = get_synthesizer(provider, DEFAULT_VOICES[provider], cache=cache, stream=stream, client=client)
+        settings = synthesis_key(provider, DEFAULT_VOICES[provider])
+        manifests = {lang: JobManifest(lang, work_dir=scratch / "work", resume=False, settings=settings)
+                     for lang in {lang for lang, _, _ in chapters}}
+        scheduler = BookScheduler(
+            concurrency=concurrency,
+            rate_limiter=rate_limiter_for_quota(concurrency, requests_per_second=args.requests_per_second),
+            on_chunk=lambda *_: None,
+            on_chapter=lambda *_: None,
+        )
+        for lang, chapter_number, chunks in chapters:
+            output = scratch / "output" / f"{lang}_{str(chapter_number).zfill(2)}.mp3"
+            scheduler.add(ChapterJob(manifests[lang], chapter_number, chunks, synthesize, output, stream=stream))
+
+        start = time.monotonic()
+        completed, failed = scheduler.run()
+        wall = time.monotonic() - start
+
+        problems = [f"{job.label} failed: {error}" for job, error in failed]
+        audio = 0.0
+        for job, _ in completed:
+            expected = expected_duration(provider, job.chunks, args.payload_scale)
+            audio += job.writer.duration
+            if abs(job.writer.duration - expected) > DURATION_TOLERANCE[provider] * len(job.chunks) + 1e-6:
+                problems.append(f"{job.label} is {job.writer.duration:.2f}s long, expected {expected:.2f}s")
+
+        rows = {row['op']: row for row in DEFAULT_METRICS.summary()}
+        DEFAULT_METRICS.close()
+    requests = rows.get('modal' if provider == 'chatterbox' else ('http_stream' if stream else 'http'), {})
+    chars = sum(len(chunk) for _, _, chunks in chapters for chunk in chunks)
+    return {
+        'name': name,
+        'wall_seconds': wall,
+        'chars': chars,
+        'chunks': sum(len(chunks) for _, _, chunks in chapters),
+        'chars_per_second': chars / wall if wall else 0.0,
+        'audio_per_second': audio / wall if wall else 0.0,
+        'p50': requests.get('p50', 0.0),
+        'p90': requests.get('p90', 0.0),
+        'p99': requests.get('p99', 0.0),
+        'retries': requests.get('retries', 0),
+        'rate_wait_seconds': rows.get('rate_wait', {}).get('total_seconds', 0.0),
+        'concat_seconds': rows.get('concat', {}).get('total_seconds', 0.0),
+        'problems': problems,
+    }
+
+
+def print_results(results):
+    print(f"{'Scenario':<28} {'Wall':>7} {'Chars/s':>8} {'Audio/s':>8} {'p50':>6} {'p90':>6} {'p99':>6} "
+          f"{'Retry':>5} {'Wait':>6} {'Concat':>6}")
+    for result in results:
+        status = "✅" if not result['problems'] else "❌"
+        print(f"{result['name']:<28} {result['wall_seconds']:6.1f}s {result['chars_per_second']:8.0f} "
+              f"{result['audio_per_second']:7.0f}x {result['p50']:5.2f}s {result['p90']:5.2f}s "
+              f"{result['p99']:5.2f}s {result['retries']:>5} {result['rate_wait_seconds']:5.1f}s "
+              f"{result['concat_seconds']:5.2f}s {status}")
+        for problem in result['problems'][:10]:
+            print(f"   ❌ {problem}")
+
+
+def compare(results, baseline_path, tolerance):
+    """Problems for scenarios whose throughput dropped more than ``tolerance`` below the baseline"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = {result['name']: result for result in json.load(f)}
+    regressions = []
+    for result in results:
+        before = baseline.get(result['name'])
+        if before is None or not before['chars_per_second']:
+            continue
+        change = result['chars_per_second'] / before['chars_per_second'] - 1
+        print(f"   {result['name']:<28} {before['chars_per_second']:8.0f} → {result['chars_per_second']:8.0f} "
+              f"chars/s ({change:+.0%})")
+        if change < -tolerance:
+            regressions.append(f"{result['name']}: throughput fell {-change:.0%}")
+        if result['chunks'] != before['chunks']:
+            regressions.append(f"{result['name']}: {before['chunks']} chunks before, {result['chunks']} now")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the audiobook pipeline against local TTS stand-ins")
+    parser.add_argument('--lang', choices=LANGUAGES + ('all',), default='all')
+    parser.add_argument('--chapters', default="", help="chapters to render, e.g. '1-3' (default: all)")
+    parser.add_argument('--provider', choices=('elevenlabs', 'chatterbox', 'both'), default='elevenlabs')
+    parser.add_argument('--concurrency', default="3,6", help="comma-separated concurrency levels to compare")
+    parser.add_argument('--requests-per-second', type=float,
+                        help="rate limit for request starts (default: one per concurrency slot)")
+    parser.add_argument('--stream', action='store_true', help="also run ElevenLabs through the streaming endpoint")
+    parser.add_argument('--latency', type=float, default=0.05, help="stub round trip in seconds")
+    parser.add_argument('--seconds-per-char', type=float, default=0.00005, help="stub generation time per character")
+    parser.add_argument('--jitter', type=float, default=0.02, help="random +/- seconds per request")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="share of ElevenLabs requests answered with 429")
+    parser.add_argument('--retry-after', type=int, help="Retry-After seconds sent with 429 responses")
+    parser.add_argument('--payload-scale', type=float, default=1.0, help="multiplier for the stub MP3 size")
+    parser.add_argument('--gpu-seconds-per-char', type=float, default=0.0002,
+                        help="stub Chatterbox model time per character")
+    parser.add_argument('--containers', type=int,
+                        help="Chatterbox GPU containers (default: one per concurrency slot)")
+    parser.add_argument('--save', help="write the results to this JSON file")
+    parser.add_argument('--compare', help="compare with results saved earlier and fail on regressions")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="allowed drop in throughput before --compare fails (default: 0.2)")
+    args = parser.parse_args()
+
+    languages = LANGUAGES if args.lang == 'all' else (args.lang,)
+    providers = ['elevenlabs', 'chatterbox'] if args.provider == 'both' else [args.provider]
+    levels = [int(level) for level in args.concurrency.split(',') if level.strip()]
+    if 'chatterbox' in providers and shutil.which('ffmpeg') is None:
+        print("⚠️  ffmpeg not found; skipping Chatterbox scenarios (its audio is transcoded to MP3)")
+        providers.remove('chatterbox')
+
+    server = StubTTSServer(latency=args.latency, seconds_per_char=args.seconds_per_char, jitter=args.jitter,
+                           error_rate=args.error_rate, retry_after=args.retry_after,
+                           payload_scale=args.payload_scale)
+    results = []
+    with server:
+        from audiobook import elevenlabs, session
+        elevenlabs.ELEVENLABS_API_BASE = server.url
+        elevenlabs.ELEVENLABS_API_KEY = elevenlabs.ELEVENLABS_API_KEY or "stub"
+        print(f"🧪 Stub TTS server on {server.url}: {args.latency}s + {args.seconds_per_char * 1000:.2f}ms/char "
+              f"± {args.jitter}s, {args.error_rate:.0%} 429s, payload x{args.payload_scale}")
+
+        for provider in providers:
+            chapters = load_chapters(languages, args.chapters, provider)
+            for concurrency in levels:
+                session.configure(concurrency)
+                if provider == 'chatterbox':
+                    client = StubChatterboxClient(containers=args.containers or concurrency, latency=args.latency,
+                                                  seconds_per_char=args.gpu_seconds_per_char, jitter=args.jitter)
+                    results.append(run_scenario(f"chatterbox c={concurrency}", provider, concurrency, chapters,
+                                                args, client=client))
+                    continue
+                results.append(run_scenario(f"elevenlabs c={concurrency}", provider, concurrency, chapters, args))
+                if args.stream:
+                    results.append(run_scenario(f"elevenlabs stream c={concurrency}", provider, concurrency,
+                                                chapters, args, stream=True))
+
+    print("=" * 100)
+    print_results(results)
+    print("=" * 100)
+
+    problems = [problem for result in results for problem in result['problems']]
+    if args.compare:
+        print(f"📈 Compared with {args.compare}:")
+        problems += compare(results, args.compare, args.tolerance)
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Results saved to {args.save}")
+
+    for problem in problems:
+        print(f"❌ {problem}")
+    if problems:
+        sys.exit(1)
+    print(f"✅ {len(results)} scenarios passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Check the sentence chunker against the manuscripts and random text
+
+For every chapter in both languages, raw and normalized, and a range of size
+limits, verifies that chunk spans are contiguous and cover the text, that the
+chunks round-trip to the original text (ignoring whitespace), that every
+chunk respects the limit and that the sidecar index can locate every chunk.
+Also checks sentence splits around abbreviations and the chapter titles
+that wrap onto a lower-case line, runs a seeded property test on synthetic
+text and checks that chunking time grows linearly with input size.
+
+    python scripts/check-chunker.py
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from audiobook.chunker import CHARS_PER_SECOND, chunk_spans, chunk_text, locate_chunks, sentence_spans
+from audiobook.normalize import MANUSCRIPT_DIRS, chapter_path, normalize_text
+
+LIMITS = [(4500, None), (2500, None), (600, None), (200, None), (4500, 20), (4500, 5)]
+
+WORDS = ["seed", "harvest", "Dr.", "e.g.", "U.S.", "etc.", "J.", "Sr.", "p.ex.", "law", "choice", "—", "(note)"]
+ENDINGS = ["", ".", "?", "!", "...", "…", ".”", "!\"", ".)", ":", ";", ","]
+
+# (lang, text, expected sentences)
+SENTENCE_CASES = [
+    ('en', "Then she said no. Then she left.", ["Then she said no.", " Then she left."]),
+    ('en', "He works for the co. Then he left.", ["He works for the co.", " Then he left."]),
+    ('en', "Turn left at the first st. Then walk.", ["Turn left at the first st.", " Then walk."]),
+    ('en', "See No. 5 and no. 6 first.", ["See No. 5 and no. 6 first."]),
+    ('en', "Did you? No. I stayed.", ["Did you?", " No.", " I stayed."]),
+    ('en', "We met St. Paul. He works at Smith & Co. Today.", ["We met St. Paul.", " He works at Smith & Co. Today."]),
+    ('en', "Dr. Smith met J. Doe. They talked.", ["Dr. Smith met J. Doe.", " They talked."]),
+    ('pt', "O Sr. Silva chegou. Depois saiu.", ["O Sr. Silva chegou.", " Depois saiu."]),
+]
+
+# (lang, chapter, title) of chapter titles wrapped onto a line starting lower-case
+TITLE_CASES = [
+    ('en', 3, "Chapter 3: The Unfair Advantage: How to Find Meaning in a World of Unfairness"),
+    ('en', 8, "Chapter 8: The Weight of Your Will: The Radical Power of Taking Responsibility"),
+    ('en', 9, "Chapter 9: The Alchemy of Will: Turning Suffering into Strength"),
+    ('pt', 3, "Capítulo 3: A Vantagem Injusta: Como Encontrar Significado em um Mundo de Injustiça"),
+    ('pt', 8, "Capítulo 8: O Peso da Sua Vontade: O Poder Radical de Assumir a Responsabilidade"),
+]
+
+
+def squash(text):
+    # Hard cuts inside a word add a space when chunks are joined, so compare without whitespace
+    return "".join(text.split())
+
+
+def check(text, max_chars, max_seconds, lang, label):
+    """Return a list of problems for one text and limit"""
+    limit = max_chars
+    if max_seconds is not None:
+        limit = min(limit, int(max_seconds * CHARS_PER_SECOND[lang]))
+    problems = []
+    spans = chunk_spans(text, max_chars, max_seconds, lang)
+    position = 0
+    for start, end in spans:
+        if start != position or end <= start:
+            problems.append(f"{label}: span ({start}, {end}) does not follow {position}")
+        if end - start > limit:
+            problems.append(f"{label}: span ({start}, {end}) exceeds {limit} characters")
+        position = end
+    if text.strip() and position != len(text):
+        problems.append(f"{label}: spans stop at {position} of {len(text)}")
+    chunks = chunk_text(text, max_chars, max_seconds, lang)
+    if squash("".join(chunks)) != squash(text):
+        problems.append(f"{label}: chunks do not round-trip to the original text")
+    for chunk, span in zip(chunks, locate_chunks(text, chunks)):
+        if span is None or text[span[0]:span[1]] != chunk:
+            problems.append(f"{label}: chunk {chunk[:30]!r} not located in the text")
+            break
+    return problems
+
+
+def random_text(rng, length):
+    """Synthetic prose with abbreviations, ellipses, quotes, odd line breaks and no final period"""
+    parts = []
+    size = 0
+    while size < length:
+        word = rng.choice(WORDS) if rng.random() < 0.2 else "".join(
+            rng.choice("abcdefghijklmnopqrstuvwxyzABC") for _ in range(rng.randint(1, 40)))
+        word += rng.choice(ENDINGS) if rng.random() < 0.15 else ""
+        separator = rng.choice([" ", " ", " ", "\n", "\n\n", "  "])
+        parts.append(word + separator)
+        size += len(word) + len(separator)
+    return "".join(parts).rstrip(".!?…”\"") + rng.choice(["", " and so on", "\n"])
+
+
+def timing(text, lang, runs=3):
+    """Best-of-``runs`` chunking time in seconds"""
+    best = float('inf')
+    for _ in range(runs):
+        start = time.perf_counter()
+        chunk_spans(text, 600, None, lang)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    problems = []
+    checked = 0
+
+    for lang, directory in MANUSCRIPT_DIRS.items():
+        for path in sorted(directory.glob("chapter_*.txt")):
+            raw = path.read_text(encoding='utf-8')
+            for form, text in (('raw', raw), ('normalized', normalize_text(raw))):
+                for max_chars, max_seconds in LIMITS:
+                    label = f"{path.name} ({lang} {form}, {max_chars}/{max_seconds})"
+                    problems += check(text, max_chars, max_seconds, lang, label)
+                    checked += 1
+
+    for lang, text, expected in SENTENCE_CASES:
+        sentences = [text[start:end] for start, end in sentence_spans(text, lang)]
+        if sentences != expected:
+            problems.append(f"sentences of {text!r}: {sentences}")
+        checked += 1
+
+    for lang, chapter, title in TITLE_CASES:
+        first = normalize_text(chapter_path(lang, chapter).read_text(encoding='utf-8')).split("\n\n")[0]
+        if first != title:
+            problems.append(f"title of {lang} chapter {chapter}: {first[:120]!r}")
+        checked += 1
+
+    rng = random.Random(1234)
+    for case in range(300):
+        lang = rng.choice(['en', 'pt'])
+        text = random_text(rng, rng.randint(0, 3000))
+        max_chars = rng.choice([1, 5, 40, 200, 1000])
+        problems += check(text, max_chars, None, lang, f"random #{case} ({lang}, {max_chars})")
+        checked += 1
+
+    sample = chapter_path('en', 1).read_text(encoding='utf-8')
+    small = timing(sample * 4, 'en')
+    large = timing(sample * 32, 'en')
+    ratio = large / small
+    print(f"⏱️  8x the text took {ratio:.1f}x the time ({small * 1000:.1f}ms → {large * 1000:.1f}ms)")
+    if ratio > 16:
+        problems.append(f"chunking time grew {ratio:.1f}x for 8x the input")
+
+    for problem in problems[:50]:
+        print(f"❌ {problem}")
+    if problems:
+        print(f"❌ {len(problems)} problems in {checked} checks")
+        sys.exit(1)
+    print(f"✅ {checked} checks passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,9 +2,13 @@
 """Generate audiobook using free proxy to bypass restrictions"""
 
 import os
-import time
-import requests
+import sys
 import random
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from audiobook.session import TIMEOUT, get_session
 
 ELEVENLABS_API_KEY = os.environ.get("ELEVENLABS_API_KEY")
 ELEVENLABS_API_BASE = "https://api.elevenlabs.io"
@@ -19,7 +23,7 @@ PROXIES = [
 def get_free_proxy():
     """Get a free proxy from public list"""
     try:
-        response = requests.get('https://www.proxy-list.download/api/v1/get?type=https', timeout=10)
+        response = get_session().get('https://www.proxy-list.download/api/v1/get?type=https', timeout=10)
         proxies = response.text.strip().split('\r\n')
         if proxies:
             proxy = random.choice(proxies)
@@ -49,12 +53,12 @@ def generate_speech(voice_id, text, use_proxy=False):
     
     proxies = get_free_proxy() if use_proxy else None
     
-    response = requests.post(
+    response = get_session().post(
         f"{ELEVENLABS_API_BASE}/v1/text-to-speech/{voice_id}?output_format=mp3_44100_128",
         headers=headers,
         json=data,
         proxies=proxies,
-        timeout=120
+        timeout=TIMEOUT
     )
     
     # Check if blocked
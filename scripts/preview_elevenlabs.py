@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Stream a short ElevenLabs preview to a file or stdout as it is generated
+
+    python scripts/preview_elevenlabs.py "Some text" | ffplay -nodisp -autoexit -
+    python scripts/preview_elevenlabs.py --chapter 3 --chars 600 -o /tmp/preview.mp3
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from audiobook.elevenlabs import stream_speech
+from audiobook.normalize import MANUSCRIPT_DIRS, chapter_path, load_normalized
+
+VOICE_ID = "9SMbtbEswwG78xP75Lqm"
+
+
+class _TimedOutput:
+    """Wraps an output file and records when the first audio byte arrived"""
+
+    def __init__(self, output):
+        self.output = output
+        self.first_byte_at = None
+
+    def write(self, data):
+        if self.first_byte_at is None:
+            self.first_byte_at = time.time()
+        self.output.write(data)
+        self.output.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream an ElevenLabs preview")
+    parser.add_argument('text', nargs='?', help="text to speak (defaults to the start of --chapter)")
+    parser.add_argument('--chapter', type=int, default=1)
+    parser.add_argument('--lang', choices=sorted(MANUSCRIPT_DIRS), default='en')
+    parser.add_argument('--chars', type=int, default=500, help="characters of the chapter to preview")
+    parser.add_argument('--voice-id', default=VOICE_ID)
+    parser.add_argument('-o', '--output', help="output MP3 path (defaults to stdout)")
+    args = parser.parse_args()
+
+    text = args.text
+    if text is None:
+        text = load_normalized(chapter_path(args.lang, args.chapter))[:args.chars]
+
+    start_time = time.time()
+    output = open(args.output, 'wb') if args.output else sys.stdout.buffer
+    try:
+        timed = _TimedOutput(output)
+        written = stream_speech(args.voice_id, text, timed)
+    finally:
+        if args.output:
+            output.close()
+
+    first_byte = (timed.first_byte_at or time.time()) - start_time
+    print(f"🎧 {written} bytes, first audio after {first_byte:.2f}s, done in {time.time() - start_time:.2f}s",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()